@@ -7,21 +7,108 @@ Provides secure user authentication and token management.
 
 import os
 import json
-import webbrowser
-import http.server
-import socketserver
+import base64
+import hashlib
+import mmap
 import threading
 import time
-from typing import Dict, Optional, Any
+from functools import lru_cache
+from typing import Dict, Optional, Any, Tuple
 from urllib.parse import urlparse, parse_qs
-import requests
-from authlib.integrations.requests_client import OAuth2Session
 from dotenv import load_dotenv
 import logging
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is the fallback
+    orjson = None
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# JSON files at least this large are parsed from a read-only memory map
+MMAP_THRESHOLD_BYTES = 10 * 1024 * 1024
+
+# /userinfo responses keyed by SHA-256 of the access token, so raw tokens never
+# sit in memory twice. Values are (expires_at, user_info) on the monotonic clock.
+USERINFO_CACHE_MAX_TTL = 300
+USERINFO_CACHE_DEFAULT_TTL = 60
+_TOKEN_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+# Parsed JWKS signing keys by kid, shared by every handler in the process. A kid
+# miss refetches the set at most once per JWKS_REFETCH_INTERVAL seconds.
+JWKS_REFETCH_INTERVAL = 60
+_JWKS_CACHE: Dict[str, Any] = {}
+_JWKS_CACHE_LOCK = threading.Lock()
+_jwks_fetched_at = float('-inf')
+
+
+def _read_json_file(path: str) -> Any:
+    """Parse a JSON file, memory-mapping it instead of copying when it is large."""
+    with open(path, 'rb') as f:
+        if orjson and os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def _token_cache_key(access_token: str) -> str:
+    """Return the cache key for an access token."""
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+def _jwt_segment(token: str, index: int) -> Dict[str, Any]:
+    """Decode one unverified JWT segment (0 = header, 1 = claims)."""
+    parts = token.split('.')
+    if len(parts) != 3:
+        raise ValueError("Not a JWT")
+    segment = parts[index] + '=' * (-len(parts[index]) % 4)
+    return json.loads(base64.urlsafe_b64decode(segment))
+
+
+def _token_expiry(access_token: str) -> Optional[float]:
+    """Read the unverified JWT ``exp`` claim, or None for opaque tokens."""
+    try:
+        return float(_jwt_segment(access_token, 1)['exp'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _cache_user_info(access_token: str, user_info: Dict[str, Any]) -> None:
+    """Cache user info until the token expires, capped at the max TTL."""
+    exp = _token_expiry(access_token)
+    if exp is None:
+        ttl = USERINFO_CACHE_DEFAULT_TTL
+    else:
+        ttl = min(USERINFO_CACHE_MAX_TTL, exp - time.time())
+    if ttl <= 0:
+        return
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[_token_cache_key(access_token)] = (time.monotonic() + ttl, user_info)
+
+
+def _cached_user_info(access_token: str) -> Optional[Dict[str, Any]]:
+    """Return cached user info for a token if the entry is still fresh."""
+    key = _token_cache_key(access_token)
+    with _TOKEN_CACHE_LOCK:
+        entry = _TOKEN_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _TOKEN_CACHE[key]
+            return None
+        return entry[1]
+
+
+def _forget_token(access_token: Optional[str]) -> None:
+    """Drop a token's cached user info."""
+    if access_token:
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE.pop(_token_cache_key(access_token), None)
+
 
 class AuthHandler:
     """Handles OAuth 2.0 authentication with Auth0."""
@@ -31,21 +118,48 @@ class AuthHandler:
         self.client_id = os.getenv('AUTH0_CLIENT_ID')
         self.client_secret = os.getenv('AUTH0_CLIENT_SECRET')
         self.callback_url = os.getenv('AUTH0_CALLBACK_URL', 'http://localhost:3000/callback')
+        self.audience = os.getenv('AUTH0_AUDIENCE')
         self.token_file = '.auth_token.json'
+
+        # Tenant endpoints, built once
+        self._issuer = f'https://{self.auth0_domain}/'
+        self._authorize_url = f'{self._issuer}authorize'
+        self._token_url = f'{self._issuer}oauth/token'
+        self._userinfo_url = f'{self._issuer}userinfo'
+        self._jwks_url = f'{self._issuer}.well-known/jwks.json'
         
         self.access_token = None
         self.user_info = None
+        self.token_claims = None
+        self._session = None
         self._load_token()
 
+    @property
+    def _http(self):
+        """HTTP session to the tenant, created on first use."""
+        if self._session is None:
+            # Imported here so commands that never reach Auth0 skip loading requests
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            # Keep-alive connections to the tenant instead of a TLS handshake per call
+            self._session = requests.Session()
+            self._session.mount("https://", HTTPAdapter(
+                pool_connections=2,
+                pool_maxsize=8,
+                max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+            ))
+        return self._session
+
     def _load_token(self) -> None:
         """Load saved authentication token."""
         try:
             if os.path.exists(self.token_file):
-                with open(self.token_file, 'r') as f:
-                    token_data = json.load(f)
-                    self.access_token = token_data.get('access_token')
-                    self.user_info = token_data.get('user_info')
-                    logger.info("Loaded saved authentication token")
+                token_data = _read_json_file(self.token_file)
+                self.access_token = token_data.get('access_token')
+                self.user_info = token_data.get('user_info')
+                logger.info("Loaded saved authentication token")
         except Exception as e:
             logger.warning(f"Could not load saved token: {e}")
 
@@ -56,15 +170,27 @@ class AuthHandler:
                 'access_token': self.access_token,
                 'user_info': self.user_info
             }
-            with open(self.token_file, 'w') as f:
-                json.dump(token_data, f)
+            payload = orjson.dumps(token_data) if orjson else json.dumps(token_data).encode()
+
+            # Write a private temp file and swap it in, so a crash mid-write
+            # never leaves a truncated token file behind
+            tmp_path = f"{self.token_file}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.token_file)
             logger.info("Saved authentication token")
         except Exception as e:
             logger.error(f"Could not save token: {e}")
 
     def is_authenticated(self) -> bool:
         """Check if user is authenticated."""
-        return self.access_token is not None
+        if self.access_token is None:
+            return False
+        if self.token_claims and 'exp' in self.token_claims:
+            return self.token_claims['exp'] > time.time()
+        return True
 
     def get_user_info(self) -> Optional[Dict[str, Any]]:
         """Get current user information."""
@@ -76,38 +202,49 @@ class AuthHandler:
             logger.error("Auth0 configuration incomplete")
             return False
 
-        try:
-            # Create OAuth session
-            oauth = OAuth2Session(
-                self.client_id,
-                redirect_uri=self.callback_url,
-                scope='openid profile email'
-            )
+        import webbrowser
+        from authlib.integrations.requests_client import OAuth2Session
 
-            # Get authorization URL
-            auth_url, state = oauth.create_authorization_url(
-                f'https://{self.auth0_domain}/authorize'
-            )
-
-            # Start local server to handle callback
-            callback_data = self._start_callback_server()
-
-            # Open browser for authentication
-            print(f"Opening browser for authentication...")
-            webbrowser.open(auth_url)
-
-            # Wait for callback
-            if callback_data:
-                code = callback_data.get('code')
+        try:
+            # Bind the callback server first so callback_url carries the real port
+            httpd = self._start_callback_server()
+
+            with httpd:
+                # Create OAuth session
+                oauth = OAuth2Session(
+                    self.client_id,
+                    redirect_uri=self.callback_url,
+                    scope='openid profile email'
+                )
+
+                # Get authorization URL; an audience makes Auth0 issue a JWT access token
+                extra_params = {'audience': self.audience} if self.audience else {}
+                auth_url, state = oauth.create_authorization_url(
+                    self._authorize_url,
+                    **extra_params
+                )
+
+                # Open browser for authentication
+                print(f"Opening browser for authentication...")
+                webbrowser.open(auth_url)
+
+                # Wait for callback
+                httpd.handle_request()
+
+            callback_query = httpd.callback_query
+            if callback_query:
+                code = parse_qs(callback_query).get('code')
                 if code:
                     # Exchange code for token
                     token = oauth.fetch_token(
-                        f'https://{self.auth0_domain}/oauth/token',
-                        authorization_response=f"{self.callback_url}?{callback_data}",
+                        self._token_url,
+                        authorization_response=f"{self.callback_url}?{callback_query}",
                         client_secret=self.client_secret
                     )
 
+                    _forget_token(self.access_token)
                     self.access_token = token['access_token']
+                    self.token_claims = None
                     
                     # Get user info
                     self.user_info = self._get_user_info(token['access_token'])
@@ -125,14 +262,18 @@ class AuthHandler:
             logger.error(f"Authentication error: {e}")
             return False
 
-    def _start_callback_server(self) -> Optional[Dict[str, str]]:
-        """Start local server to handle OAuth callback."""
-        callback_data = None
+    def _start_callback_server(self) -> 'socketserver.TCPServer':
+        """Bind the local server that receives the OAuth callback.
+
+        Port 0 in AUTH0_CALLBACK_URL lets the OS pick a free port, and
+        callback_url is rewritten to match.
+        """
+        import http.server
+        import socketserver
 
         class CallbackHandler(http.server.BaseHTTPRequestHandler):
             def do_GET(self):
-                nonlocal callback_data
-                callback_data = parse_qs(urlparse(self.path).query)
+                self.server.callback_query = urlparse(self.path).query
                 
                 # Send success response
                 self.send_response(200)
@@ -149,34 +290,53 @@ class AuthHandler:
                 """
                 self.wfile.write(response.encode())
 
-        # Start server
-        with socketserver.TCPServer(("localhost", 3000), CallbackHandler) as httpd:
-            httpd.timeout = 60  # 60 second timeout
-            httpd.handle_request()
+        class CallbackServer(socketserver.TCPServer):
+            # Rebind right away instead of waiting out TIME_WAIT from the last login
+            allow_reuse_address = True
+
+        callback = urlparse(self.callback_url)
+        host = callback.hostname or 'localhost'
+        port = callback.port if callback.port is not None else 3000
+
+        httpd = CallbackServer((host, port), CallbackHandler)
+        httpd.timeout = 60  # 60 second timeout
+        httpd.callback_query = None
 
-        return callback_data
+        bound_port = httpd.server_address[1]
+        if bound_port != port:
+            self.callback_url = callback._replace(netloc=f"{host}:{bound_port}").geturl()
+        return httpd
 
     def _get_user_info(self, access_token: str) -> Optional[Dict[str, Any]]:
-        """Get user information from Auth0."""
+        """Get user information from Auth0, served from cache when fresh."""
+        user_info = _cached_user_info(access_token)
+        if user_info is not None:
+            return user_info
+
         try:
             headers = {'Authorization': f'Bearer {access_token}'}
-            response = requests.get(
-                f'https://{self.auth0_domain}/userinfo',
+            response = self._http.get(
+                self._userinfo_url,
                 headers=headers
             )
             response.raise_for_status()
-            return response.json()
+            user_info = response.json()
         except Exception as e:
             logger.error(f"Error getting user info: {e}")
             return None
 
+        _cache_user_info(access_token, user_info)
+        return user_info
+
     def logout(self) -> None:
         """Logout user and clear tokens."""
         try:
             if os.path.exists(self.token_file):
                 os.remove(self.token_file)
+            _forget_token(self.access_token)
             self.access_token = None
             self.user_info = None
+            self.token_claims = None
             logger.info("Logged out successfully")
         except Exception as e:
             logger.error(f"Error during logout: {e}")
@@ -193,21 +353,68 @@ class AuthHandler:
             return {'Authorization': f'Bearer {self.access_token}'}
         return {}
 
+    def _get_signing_key(self, kid: str) -> Any:
+        """Get the parsed signing key for a kid, refetching the JWKS on a miss."""
+        global _jwks_fetched_at
+        from authlib.jose import JsonWebKey
+
+        with _JWKS_CACHE_LOCK:
+            key = _JWKS_CACHE.get(kid)
+            if key is None and time.monotonic() - _jwks_fetched_at >= JWKS_REFETCH_INTERVAL:
+                # Unknown kid: first use, or Auth0 rotated its keys
+                _jwks_fetched_at = time.monotonic()
+                response = self._http.get(self._jwks_url)
+                response.raise_for_status()
+                for jwk in response.json().get('keys', []):
+                    if 'kid' in jwk:
+                        _JWKS_CACHE[jwk['kid']] = JsonWebKey.import_key(jwk)
+                key = _JWKS_CACHE.get(kid)
+        if key is None:
+            raise ValueError(f"No signing key for kid {kid!r}")
+        return key
+
+    def _decode_jwt(self, token: str) -> Dict[str, Any]:
+        """Verify a JWT access token locally and return its claims."""
+        from authlib.jose import JsonWebToken
+        from authlib.jose.errors import DecodeError
+
+        try:
+            kid = _jwt_segment(token, 0)['kid']
+        except (ValueError, KeyError, TypeError):
+            raise DecodeError("Token has no readable kid")
+
+        claims_options = {
+            'iss': {'essential': True, 'value': self._issuer},
+            'exp': {'essential': True},
+        }
+        if self.audience:
+            claims_options['aud'] = {'essential': True, 'value': self.audience}
+
+        # Auth0 signs access tokens with RS256; accepting any other alg
+        # would let a token pick how its own signature is checked
+        claims = JsonWebToken(['RS256']).decode(token, self._get_signing_key(kid), claims_options=claims_options)
+        claims.validate()
+        return dict(claims)
+
     def validate_token(self) -> bool:
-        """Validate current token."""
+        """Validate current token, locally when it is a JWT."""
         if not self.access_token:
             return False
 
-        try:
-            headers = {'Authorization': f'Bearer {self.access_token}'}
-            response = requests.get(
-                f'https://{self.auth0_domain}/userinfo',
-                headers=headers
-            )
-            return response.status_code == 200
-        except Exception as e:
-            logger.error(f"Token validation error: {e}")
-            return False
+        if self.access_token.count('.') == 2:
+            from authlib.jose.errors import DecodeError
+
+            try:
+                self.token_claims = self._decode_jwt(self.access_token)
+                return True
+            except DecodeError:
+                pass  # Opaque token, only Auth0 can vouch for it
+            except Exception as e:
+                logger.error(f"Token validation error: {e}")
+                self.token_claims = None
+                return False
+
+        return self._get_user_info(self.access_token) is not None
 
 
 class SimpleAuthHandler:
@@ -244,8 +451,9 @@ class SimpleAuthHandler:
         return {"X-User-ID": self.user_id}
 
 
+@lru_cache(maxsize=1)
 def get_auth_handler() -> AuthHandler:
-    """Get appropriate authentication handler."""
+    """Get appropriate authentication handler, created once per process."""
     # Check if Auth0 is configured
     if all([
         os.getenv('AUTH0_DOMAIN'),
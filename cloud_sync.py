@@ -7,23 +7,58 @@ Provides RESTful API integration for task storage and retrieval.
 
 import os
 import json
-import requests
-from typing import Dict, List, Optional, Any
+import importlib.util
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from datetime import datetime, timezone
 import logging
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+import threading
+import time
 from dotenv import load_dotenv
 
+# pymongo, requests and httpx are imported where they are used, so commands
+# that never touch the cloud don't pay for loading them
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the h2 package, installed by the httpx[http2] extra
+HTTPX_AVAILABLE = importlib.util.find_spec("httpx") is not None
+HTTP2_AVAILABLE = HTTPX_AVAILABLE and importlib.util.find_spec("h2") is not None
+
+# How long a successful ping vouches for the connection
+PING_TTL_SECONDS = 5.0
+# How long a health report is reused before dbStats/collStats run again
+HEALTH_TTL_SECONDS = 5.0
+# Upserts per bulk_write, bounding both memory and wire message size
+SYNC_BATCH_SIZE = 1000
+# Documents per cursor round trip when reading tasks back
+CURSOR_BATCH_SIZE = 500
+# Single-field task indexes made redundant by the compound ones; dropped so
+# writes stop maintaining them
+LEGACY_TASK_INDEXES = ("user_id_1", "status_1", "priority_1", "created_at_1")
+# MongoDB error code for dropping an index that does not exist
+INDEX_NOT_FOUND = 27
+
 
 class CloudSyncError(Exception):
     """Custom exception for cloud sync errors."""
     pass
 
 
+def _copy_tasks(tasks: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a task mapping so callers cannot mutate cached task data."""
+    return {task_id: dict(task_data) for task_id, task_data in tasks.items()}
+
+
+def _copy_health(health: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a health report so callers cannot mutate the cached one."""
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in health.items()}
+
+
 class MongoDBCloudSync:
     """Handles cloud synchronization with MongoDB Atlas."""
 
@@ -32,6 +67,31 @@ class MongoDBCloudSync:
         self.client = None
         self.db = None
         self.collection = None
+        self.counts_collection = None
+        self.state_collection = None
+        self._last_ping_ok_at = 0.0
+        # (monotonic time, report) of the last successful health check
+        self._health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+        # In-memory mirror of one user's tasks, kept current by a change stream
+        self._stream_user_id = None
+        self._stream_tasks: Dict[str, Any] = {}
+        self._stream_doc_ids: Dict[Any, str] = {}
+        self._stream_lock = threading.Lock()
+        self._stream_stop = threading.Event()
+        self._stream_thread = None
+        self._resume_token = None
+        # Set while the follower reconnects; the mirror may be missing changes
+        self._stream_resuming = False
+        # Task writes by this client started and finished, and how many
+        # started writes the mirror is known to include. Change events can
+        # lag a write, so the mirror only serves reads when none are newer.
+        self._writes_started = 0
+        self._writes_finished = 0
+        self._stream_writes_seen = 0
+
+        # user_id -> (data version, tasks) from the last full fetch
+        self._from_cloud_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
         self._connect()
 
     def _connect(self) -> None:
@@ -40,6 +100,9 @@ class MongoDBCloudSync:
             logger.warning("MONGODB_URI not found in environment variables")
             return
 
+        from pymongo import MongoClient
+        from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+
         try:
             self.client = MongoClient(
                 self.mongodb_uri,
@@ -48,15 +111,14 @@ class MongoDBCloudSync:
             )
             # Test the connection
             self.client.admin.command('ping')
+            self._last_ping_ok_at = time.monotonic()
             
             self.db = self.client.task_reminder
             self.collection = self.db.tasks
+            self.counts_collection = self.db.task_counts
+            self.state_collection = self.db.sync_state
             
-            # Create indexes for better performance
-            self.collection.create_index("user_id")
-            self.collection.create_index("status")
-            self.collection.create_index("priority")
-            self.collection.create_index("created_at")
+            self._ensure_indexes()
             
             logger.info("Successfully connected to MongoDB Atlas")
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
@@ -66,9 +128,204 @@ class MongoDBCloudSync:
             logger.error(f"Unexpected error connecting to MongoDB: {e}")
             self.client = None
 
+    def _ensure_indexes(self) -> None:
+        """Create the indexes the sync queries rely on and drop the ones they replaced."""
+        from pymongo.errors import OperationFailure
+
+        # Every query filters on user_id first, so (user_id, task_id) serves
+        # point lookups, upserts and per-user scans alike.
+        indexes = [
+            (self.collection, [("user_id", 1), ("task_id", 1)], {"unique": True}),
+            (self.collection, [("user_id", 1), ("data.status", 1)],
+             {"partialFilterExpression": {"data.status": {"$exists": True}}}),
+            (self.counts_collection, [("user_id", 1), ("status", 1)], {"unique": True}),
+            (self.state_collection, [("user_id", 1)], {"unique": True}),
+        ]
+        for collection, keys, options in indexes:
+            try:
+                collection.create_index(keys, **options)
+            except OperationFailure as e:
+                logger.warning(f"Could not create index {keys}: {e}")
+
+        for name in LEGACY_TASK_INDEXES:
+            try:
+                self.collection.drop_index(name)
+            except OperationFailure as e:
+                if e.code != INDEX_NOT_FOUND:
+                    logger.warning(f"Could not drop index {name}: {e}")
+
+    def _forget_ping(self) -> None:
+        """Make the next is_connected() ping again, after an operation failed."""
+        self._last_ping_ok_at = 0.0
+        self._health_cache = None
+
     def is_connected(self) -> bool:
-        """Check if connected to MongoDB."""
-        return self.client is not None and self.client.admin.command('ping')
+        """Check if connected to MongoDB, pinging at most once per PING_TTL_SECONDS."""
+        if self.client is None:
+            return False
+        if time.monotonic() - self._last_ping_ok_at < PING_TTL_SECONDS:
+            return True
+
+        try:
+            self.client.admin.command('ping')
+        except Exception as e:
+            logger.warning(f"MongoDB ping failed: {e}")
+            return False
+        self._last_ping_ok_at = time.monotonic()
+        return True
+
+    @contextmanager
+    def _own_write(self) -> Iterator[None]:
+        """Count a write to the tasks collection, so the mirror isn't trusted past it."""
+        with self._stream_lock:
+            self._writes_started += 1
+        try:
+            yield
+        finally:
+            with self._stream_lock:
+                self._writes_finished += 1
+
+    def _writes_settled(self) -> Optional[int]:
+        """Get the count of started writes if none is still in flight, else None."""
+        if self._writes_finished == self._writes_started:
+            return self._writes_started
+        return None
+
+    def _bump_data_version(self, user_id: str) -> None:
+        """Record that a user's cloud tasks changed."""
+        self.state_collection.update_one(
+            {"user_id": user_id},
+            {"$inc": {"version": 1}, "$currentDate": {"updated_at": True}},
+            upsert=True
+        )
+
+    def _data_version(self, user_id: str) -> Optional[int]:
+        """Get the current data version of a user's cloud tasks."""
+        state = self.state_collection.find_one({"user_id": user_id}, {"_id": 0, "version": 1})
+        return state.get("version") if state else None
+
+    def _apply_count_changes(self, changes: Counter, user_id: str) -> None:
+        """Apply per-status count deltas to the materialized counters."""
+        from pymongo import UpdateOne
+
+        if self.counts_collection.count_documents({"user_id": user_id}, limit=1) == 0:
+            # No counters yet (first sync, or data older than the counters)
+            self._rebuild_counts(user_id)
+            return
+
+        operations = [
+            UpdateOne({"user_id": user_id, "status": status}, {"$inc": {"count": delta}}, upsert=True)
+            for status, delta in changes.items()
+            if delta
+        ]
+        if operations:
+            self.counts_collection.bulk_write(operations, ordered=False)
+
+    def _rebuild_counts(self, user_id: str) -> Dict[str, int]:
+        """Recount tasks per status and overwrite the materialized counters."""
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {"$group": {
+                "_id": "$data.status",
+                "count": {"$sum": 1}
+            }}
+        ]
+        stats = {stat["_id"]: stat["count"] for stat in self.collection.aggregate(pipeline)}
+
+        self.counts_collection.delete_many({"user_id": user_id})
+        if stats:
+            self.counts_collection.insert_many([
+                {"user_id": user_id, "status": status, "count": count}
+                for status, count in stats.items()
+            ])
+        return stats
+
+    def _upsert_batch(self, batch: List[Tuple[str, Dict[str, Any]]], user_id: str,
+                      synced_at: str) -> Counter:
+        """Upsert one chunk of tasks and return its per-status count deltas."""
+        from pymongo import UpdateOne
+
+        # Status of the stored copies, to keep the counters in step
+        previous = {
+            doc["task_id"]: doc.get("data", {}).get("status")
+            for doc in self.collection.find(
+                {"user_id": user_id, "task_id": {"$in": [task_id for task_id, _ in batch]}},
+                {"_id": 0, "task_id": 1, "data.status": 1}
+            )
+        }
+
+        with self._own_write():
+            self.collection.bulk_write([
+                UpdateOne(
+                    {"task_id": task_id, "user_id": user_id},
+                    {"$set": {
+                        "task_id": task_id,
+                        "user_id": user_id,
+                        "data": task_data,
+                        "synced_at": synced_at
+                    }},
+                    upsert=True
+                )
+                for task_id, task_data in batch
+            ], ordered=False)
+
+        count_changes = Counter()
+        for task_id, task_data in batch:
+            new_status = task_data.get("status")
+            if task_id in previous:
+                if previous[task_id] == new_status:
+                    continue
+                count_changes[previous[task_id]] -= 1
+            count_changes[new_status] += 1
+        return count_changes
+
+    def _delete_batch(self, task_ids: List[str], user_id: str) -> int:
+        """Delete tasks in one delete_many, keeping the counters in step, and return the count."""
+        task_filter = {"user_id": user_id, "task_id": {"$in": list(task_ids)}}
+        removed = Counter(
+            doc.get("data", {}).get("status")
+            for doc in self.collection.find(task_filter, {"_id": 0, "data.status": 1})
+        )
+        with self._own_write():
+            deleted_count = self.collection.delete_many(task_filter).deleted_count
+
+        if deleted_count:
+            if deleted_count == sum(removed.values()):
+                self._apply_count_changes(
+                    Counter({status: -count for status, count in removed.items()}), user_id
+                )
+            else:
+                # Set changed between the lookup and the delete
+                self._rebuild_counts(user_id)
+        return deleted_count
+
+    def apply_task_delta(self, upserts: Dict[str, Any] = None, deletes: List[str] = None,
+                         user_id: str = "default") -> bool:
+        """Push only the tasks that changed: upserts by task ID, plus deleted task IDs."""
+        if not self.is_connected():
+            logger.warning("Not connected to MongoDB, skipping cloud sync")
+            return False
+
+        try:
+            changed = False
+            if upserts:
+                synced_at = datetime.now(timezone.utc).isoformat()
+                count_changes = self._upsert_batch(list(upserts.items()), user_id, synced_at)
+                self._apply_count_changes(count_changes, user_id)
+                changed = True
+            if deletes:
+                changed = self._delete_batch(deletes, user_id) > 0 or changed
+
+            if changed:
+                self._bump_data_version(user_id)
+            logger.info(f"Synced {len(upserts or ())} changed and "
+                        f"{len(deletes or ())} deleted tasks to cloud")
+            return True
+
+        except Exception as e:
+            self._forget_ping()
+            logger.error(f"Error syncing task changes to cloud: {e}")
+            raise CloudSyncError(f"Failed to sync task changes to cloud: {e}")
 
     def sync_tasks_to_cloud(self, tasks_data: Dict[str, Any], user_id: str = "default") -> bool:
         """Sync local tasks to cloud database."""
@@ -77,54 +334,212 @@ class MongoDBCloudSync:
             return False
 
         try:
-            # Prepare tasks for cloud storage
-            cloud_tasks = []
-            for task_id, task_data in tasks_data.items():
-                cloud_task = {
-                    "task_id": task_id,
-                    "user_id": user_id,
-                    "data": task_data,
-                    "synced_at": datetime.now(timezone.utc).isoformat()
-                }
-                cloud_tasks.append(cloud_task)
-
-            # Use upsert to handle both insert and update
-            for cloud_task in cloud_tasks:
-                self.collection.update_one(
-                    {"task_id": cloud_task["task_id"], "user_id": user_id},
-                    {"$set": cloud_task},
-                    upsert=True
-                )
-
-            logger.info(f"Successfully synced {len(cloud_tasks)} tasks to cloud")
+            # One timestamp for the whole sync; each chunk is a single bulk write
+            synced_at = datetime.now(timezone.utc).isoformat()
+            count_changes = Counter()
+            synced = 0
+
+            items = iter(tasks_data.items())
+            while True:
+                batch = list(islice(items, SYNC_BATCH_SIZE))
+                if not batch:
+                    break
+                count_changes.update(self._upsert_batch(batch, user_id, synced_at))
+                synced += len(batch)
+
+            if synced:
+                self._apply_count_changes(count_changes, user_id)
+                self._bump_data_version(user_id)
+
+            logger.info(f"Successfully synced {synced} tasks to cloud")
             return True
 
         except Exception as e:
+            self._forget_ping()
             logger.error(f"Error syncing tasks to cloud: {e}")
             raise CloudSyncError(f"Failed to sync tasks to cloud: {e}")
 
+    def start_change_stream(self, user_id: str = "default") -> bool:
+        """Mirror a user's cloud tasks in memory and follow changes to them."""
+        if not self.is_connected():
+            return False
+        self.stop_change_stream()
+
+        try:
+            with self._stream_lock:
+                writes_seen = self._writes_settled()
+            # Open the stream before the initial scan so no change slips between them
+            stream = self._open_change_stream(user_id)
+            tasks, doc_ids = self._scan_tasks(user_id)
+        except Exception as e:
+            # Change streams need a replica set; standalone servers refuse them
+            logger.warning(f"Could not start change stream: {e}")
+            return False
+
+        with self._stream_lock:
+            self._stream_user_id = user_id
+            self._stream_tasks = tasks
+            self._stream_doc_ids = doc_ids
+            # A write in flight during the scan may have been missed
+            self._stream_writes_seen = -1 if writes_seen is None else writes_seen
+        self._resume_token = None
+        self._stream_resuming = False
+        self._stream_stop.clear()
+        self._stream_thread = threading.Thread(
+            target=self._follow_change_stream, args=(stream,), daemon=True
+        )
+        self._stream_thread.start()
+        logger.info(f"Following cloud changes for {len(tasks)} tasks")
+        return True
+
+    def _scan_tasks(self, user_id: str) -> Tuple[Dict[str, Any], Dict[Any, str]]:
+        """Read a user's tasks, plus each document's _id to map delete events back."""
+        tasks, doc_ids = {}, {}
+        for doc in self.collection.find({"user_id": user_id}, {"task_id": 1, "data": 1}):
+            tasks[doc["task_id"]] = doc["data"]
+            doc_ids[doc["_id"]] = doc["task_id"]
+        return tasks, doc_ids
+
+    def stop_change_stream(self) -> None:
+        """Stop following cloud changes and drop the in-memory mirror."""
+        thread = self._stream_thread
+        if thread is None:
+            return
+        self._stream_stop.set()
+        thread.join(timeout=2.0)
+        self._stream_thread = None
+        with self._stream_lock:
+            self._stream_user_id = None
+            self._stream_tasks = {}
+            self._stream_doc_ids = {}
+
+    def _open_change_stream(self, user_id: str, resume_after: Any = None):
+        """Open a change stream over the tasks collection for one user."""
+        # Delete events carry only the _id, so they cannot be filtered by user here
+        return self.collection.watch(
+            [{"$match": {"$or": [
+                {"fullDocument.user_id": user_id},
+                {"operationType": "delete"}
+            ]}}],
+            full_document="updateLookup",
+            resume_after=resume_after
+        )
+
+    def _follow_change_stream(self, stream) -> None:
+        """Apply change events to the in-memory mirror until stopped."""
+        from pymongo.errors import PyMongoError
+
+        user_id = self._stream_user_id
+        try:
+            while not self._stream_stop.is_set():
+                try:
+                    with stream:
+                        while not self._stream_stop.is_set() and stream.alive:
+                            change = stream.try_next()
+                            if change is not None:
+                                self._apply_change(change)
+                            else:
+                                # Caught up with everything missed while resuming
+                                self._stream_resuming = False
+                            self._resume_token = stream.resume_token
+                    break
+                except PyMongoError as e:
+                    if self._resume_token is None:
+                        raise
+                    # Pick up where we left off; the mirror stays valid
+                    logger.warning(f"Change stream interrupted, resuming: {e}")
+                    self._stream_resuming = True
+                    self._stream_stop.wait(1.0)
+                    stream = self._open_change_stream(user_id, resume_after=self._resume_token)
+        except Exception as e:
+            logger.warning(f"Change stream stopped: {e}")
+        finally:
+            with self._stream_lock:
+                self._stream_user_id = None
+
+    def _apply_change(self, change: Dict[str, Any]) -> None:
+        """Fold one change event into the in-memory mirror."""
+        operation = change["operationType"]
+        with self._stream_lock:
+            if operation == "delete":
+                task_id = self._stream_doc_ids.pop(change["documentKey"]["_id"], None)
+                if task_id is not None:
+                    self._stream_tasks.pop(task_id, None)
+            elif operation in ("insert", "update", "replace"):
+                doc = change.get("fullDocument")
+                if doc is not None:
+                    self._stream_tasks[doc["task_id"]] = doc.get("data")
+                    self._stream_doc_ids[doc["_id"]] = doc["task_id"]
+            else:
+                # drop, rename or invalidate: the mirror can no longer be trusted
+                self._stream_user_id = None
+                self._stream_stop.set()
+
+    def _stream_is_live(self, user_id: str) -> bool:
+        """Check whether the change stream mirror covers this user."""
+        return (
+            self._stream_user_id == user_id
+            and self._stream_thread is not None
+            and self._stream_thread.is_alive()
+            and not self._stream_resuming
+        )
+
+    def iter_tasks_from_cloud(self, user_id: str = "default") -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (task_id, data) pairs as the cursor delivers them."""
+        if not self.is_connected():
+            logger.warning("Not connected to MongoDB, skipping cloud sync")
+            return
+
+        cursor = self.collection.find(
+            {"user_id": user_id},
+            {"_id": 0, "task_id": 1, "data": 1}
+        ).batch_size(CURSOR_BATCH_SIZE)
+        for cloud_task in cursor:
+            yield cloud_task["task_id"], cloud_task["data"]
+
     def sync_tasks_from_cloud(self, user_id: str = "default") -> Dict[str, Any]:
         """Sync tasks from cloud database to local."""
+        with self._stream_lock:
+            live = self._stream_is_live(user_id)
+            if live and self._stream_writes_seen == self._writes_started:
+                return _copy_tasks(self._stream_tasks)
+            writes_seen = self._writes_settled()
+
         if not self.is_connected():
             logger.warning("Not connected to MongoDB, skipping cloud sync")
             return {}
 
         try:
+            if live:
+                # Our own writes may not have reached the stream yet: read
+                # them back directly and refresh the mirror with the result
+                tasks, doc_ids = self._scan_tasks(user_id)
+                with self._stream_lock:
+                    if self._stream_is_live(user_id):
+                        self._stream_tasks = tasks
+                        self._stream_doc_ids = doc_ids
+                        self._stream_writes_seen = -1 if writes_seen is None else writes_seen
+                logger.info(f"Successfully synced {len(tasks)} tasks from cloud")
+                return _copy_tasks(tasks)
+
+            # Cheap point read; skip the full fetch when nothing has changed
+            version = self._data_version(user_id)
+            cached = self._from_cloud_cache.get(user_id)
+            if version is not None and cached is not None and cached[0] == version:
+                logger.info(f"Cloud tasks unchanged, reusing {len(cached[1])} cached tasks")
+                return _copy_tasks(cached[1])
+
             # Get all tasks for the user
-            cloud_tasks = list(self.collection.find(
-                {"user_id": user_id},
-                {"_id": 0, "task_id": 1, "data": 1}
-            ))
+            local_tasks = dict(self.iter_tasks_from_cloud(user_id))
 
-            # Convert to local format
-            local_tasks = {}
-            for cloud_task in cloud_tasks:
-                local_tasks[cloud_task["task_id"]] = cloud_task["data"]
+            if version is not None:
+                self._from_cloud_cache[user_id] = (version, local_tasks)
 
             logger.info(f"Successfully synced {len(local_tasks)} tasks from cloud")
-            return local_tasks
+            return _copy_tasks(local_tasks)
 
         except Exception as e:
+            self._forget_ping()
             logger.error(f"Error syncing tasks from cloud: {e}")
             raise CloudSyncError(f"Failed to sync tasks from cloud: {e}")
 
@@ -134,82 +549,84 @@ class MongoDBCloudSync:
             return {"error": "Not connected to cloud database"}
 
         try:
-            pipeline = [
-                {"$match": {"user_id": user_id}},
-                {"$group": {
-                    "_id": "$data.status",
-                    "count": {"$sum": 1}
-                }}
-            ]
-            
-            status_stats = list(self.collection.aggregate(pipeline))
-            
-            # Convert to readable format
-            stats = {}
-            for stat in status_stats:
-                status = stat["_id"]
-                count = stat["count"]
-                stats[status] = count
+            counters = list(self.counts_collection.find(
+                {"user_id": user_id},
+                {"_id": 0, "status": 1, "count": 1}
+            ))
+            if not counters:
+                return self._rebuild_counts(user_id)
 
-            return stats
+            return {
+                counter["status"]: counter["count"]
+                for counter in counters
+                if counter["count"] > 0
+            }
 
         except Exception as e:
+            self._forget_ping()
             logger.error(f"Error getting cloud statistics: {e}")
             return {"error": str(e)}
 
     def delete_task_from_cloud(self, task_id: str, user_id: str = "default") -> bool:
         """Delete a task from cloud database."""
+        return self.delete_tasks_from_cloud([task_id], user_id) == 1
+
+    def delete_tasks_from_cloud(self, task_ids: List[str], user_id: str = "default") -> int:
+        """Delete several tasks from cloud database in one round trip, returning how many were removed."""
         if not self.is_connected():
             logger.warning("Not connected to MongoDB, skipping cloud delete")
-            return False
+            return 0
 
         try:
-            result = self.collection.delete_one({
-                "task_id": task_id,
-                "user_id": user_id
-            })
-            
-            if result.deleted_count > 0:
-                logger.info(f"Successfully deleted task {task_id} from cloud")
-                return True
+            deleted_count = self._delete_batch(task_ids, user_id)
+
+            if deleted_count:
+                self._bump_data_version(user_id)
+                logger.info(f"Successfully deleted {deleted_count} task(s) from cloud")
             else:
-                logger.warning(f"Task {task_id} not found in cloud")
-                return False
+                logger.warning(f"Task(s) {', '.join(task_ids)} not found in cloud")
+            return deleted_count
 
         except Exception as e:
-            logger.error(f"Error deleting task from cloud: {e}")
-            raise CloudSyncError(f"Failed to delete task from cloud: {e}")
+            self._forget_ping()
+            logger.error(f"Error deleting tasks from cloud: {e}")
+            raise CloudSyncError(f"Failed to delete tasks from cloud: {e}")
 
-    def search_tasks_in_cloud(self, query: str, user_id: str = "default") -> List[Dict[str, Any]]:
-        """Search tasks in cloud database."""
+    def search_tasks_in_cloud(self, query: str, user_id: str = "default",
+                              limit: int = 0) -> List[Dict[str, Any]]:
+        """Search tasks in cloud database, returning at most limit results (0 = all)."""
         if not self.is_connected():
             logger.warning("Not connected to MongoDB, skipping cloud search")
             return []
 
         try:
             # MongoDB text search
-            cloud_tasks = list(self.collection.find({
+            cursor = self.collection.find({
                 "user_id": user_id,
                 "$text": {"$search": query}
-            }, {"_id": 0, "task_id": 1, "data": 1}))
+            }, {"_id": 0, "task_id": 1, "data": 1}).limit(limit).batch_size(CURSOR_BATCH_SIZE)
 
-            # Convert to local format
-            results = []
-            for cloud_task in cloud_tasks:
-                results.append({
-                    "task_id": cloud_task["task_id"],
-                    **cloud_task["data"]
-                })
+            # Convert to local format straight off the cursor
+            results = [
+                {"task_id": cloud_task["task_id"], **cloud_task["data"]}
+                for cloud_task in cursor
+            ]
 
             logger.info(f"Found {len(results)} tasks matching '{query}' in cloud")
             return results
 
         except Exception as e:
+            self._forget_ping()
             logger.error(f"Error searching tasks in cloud: {e}")
             return []
 
     def get_cloud_health(self) -> Dict[str, Any]:
-        """Get cloud database health status."""
+        """Get cloud database health status, reusing a report up to HEALTH_TTL_SECONDS old."""
+        if self._health_cache is not None:
+            checked_at, health = self._health_cache
+            if time.monotonic() - checked_at < HEALTH_TTL_SECONDS:
+                return _copy_health(health)
+
         if not self.is_connected():
             return {
                 "status": "disconnected",
@@ -217,14 +634,16 @@ class MongoDBCloudSync:
             }
 
         try:
-            # Test connection
-            self.client.admin.command('ping')
-            
-            # Get basic stats
-            db_stats = self.db.command("dbStats")
-            collection_stats = self.collection.stats()
+            # Independent round trips, so issue them concurrently over the client's pool
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                db_stats_future = executor.submit(self.db.command, "dbStats")
+                collection_stats_future = executor.submit(
+                    self.db.command, "collStats", self.collection.name
+                )
+                db_stats = db_stats_future.result()
+                collection_stats = collection_stats_future.result()
             
-            return {
+            health = {
                 "status": "connected",
                 "database": {
                     "name": self.db.name,
@@ -238,8 +657,11 @@ class MongoDBCloudSync:
                 },
                 "last_check": datetime.now(timezone.utc).isoformat()
             }
+            self._health_cache = (time.monotonic(), health)
+            return _copy_health(health)
 
         except Exception as e:
+            self._forget_ping()
             logger.error(f"Error checking cloud health: {e}")
             return {
                 "status": "error",
@@ -248,6 +670,8 @@ class MongoDBCloudSync:
 
     def close_connection(self) -> None:
         """Close MongoDB connection."""
+        self.stop_change_stream()
+        self._health_cache = None
         if self.client:
             self.client.close()
             logger.info("Closed MongoDB connection")
@@ -258,32 +682,59 @@ class RESTfulAPIClient:
     
     def __init__(self, base_url: str = None):
         self.base_url = base_url or os.getenv('API_BASE_URL', 'http://localhost:8000')
-        self.session = requests.Session()
-        self.session.headers.update({
+        headers = {
             'Content-Type': 'application/json',
             'Accept': 'application/json'
-        })
+        }
+
+        import requests
+
+        # Errors from either HTTP library surface as CloudSyncError
+        self._http_errors = (requests.exceptions.RequestException,)
+        if HTTPX_AVAILABLE:
+            import httpx
+
+            # Concurrent requests share one multiplexed connection over HTTP/2
+            self._http_errors += (httpx.HTTPError,)
+            self.session = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                headers=headers,
+                timeout=httpx.Timeout(10.0, connect=3.0),
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+            )
+        else:
+            from requests.adapters import HTTPAdapter
+
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+            self.session.headers.update(headers)
+
+        # HTTP method -> (session call, whether it sends a JSON body)
+        self._dispatch = {
+            'GET': (self.session.get, False),
+            'POST': (self.session.post, True),
+            'PUT': (self.session.put, True),
+            'PATCH': (self.session.patch, True),
+            'DELETE': (self.session.delete, False),
+        }
 
     def _make_request(self, method: str, endpoint: str, data: Dict = None) -> Dict[str, Any]:
         """Make HTTP request to API."""
         url = f"{self.base_url}{endpoint}"
         
         try:
-            if method.upper() == 'GET':
-                response = self.session.get(url)
-            elif method.upper() == 'POST':
-                response = self.session.post(url, json=data)
-            elif method.upper() == 'PUT':
-                response = self.session.put(url, json=data)
-            elif method.upper() == 'DELETE':
-                response = self.session.delete(url)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+            send, has_body = self._dispatch[method.upper()]
+        except KeyError:
+            raise ValueError(f"Unsupported HTTP method: {method}")
 
+        try:
+            response = send(url, json=data) if has_body else send(url)
             response.raise_for_status()
             return response.json()
 
-        except requests.exceptions.RequestException as e:
+        except self._http_errors as e:
             logger.error(f"API request failed: {e}")
             raise CloudSyncError(f"API request failed: {e}")
 
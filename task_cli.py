@@ -7,20 +7,24 @@ Supports local JSON storage and MongoDB Atlas cloud sync.
 """
 
 import argparse
+import atexit
 import sys
 import os
 import logging
-from typing import List, Dict, Any
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_for
+from functools import partial
+from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
-from task_manager import TaskManager, Priority, TaskStatus
+from task_manager import TaskManager, TaskStatus, PRIORITY_BY_VALUE, STATUS_BY_VALUE
 from cloud_sync import MongoDBCloudSync, CloudSyncError
 from auth_handler import get_auth_handler
 from utils import (
     create_task_table, create_statistics_panel, create_cloud_health_panel,
     prompt_for_task_details, confirm_action, print_success, print_error,
     print_warning, print_info, create_search_results_table,
-    validate_priority, validate_status, parse_date, console
+    parse_date, console
 )
 
 # Load environment variables
@@ -33,21 +37,119 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Buffered cloud changes are sent once this many are pending, or once the
+# oldest has waited this long
+PENDING_FLUSH_THRESHOLD = 50
+PENDING_FLUSH_INTERVAL = 0.2
+
+
+def _report_sync_failure(future: Future) -> None:
+    """Warn about a background cloud update that failed."""
+    _report_sync_error(future.exception())
+
+
+def _report_sync_error(error: Optional[BaseException]) -> None:
+    """Warn about a cloud update that failed, if it did."""
+    if isinstance(error, CloudSyncError):
+        print_warning(f"Cloud sync failed: {error}")
+    elif error is not None:
+        logger.error("Unexpected cloud sync error: %s", error)
+
 
 class TaskCLI:
     """Main CLI application for task management."""
 
     def __init__(self):
         self.task_manager = TaskManager()
+        atexit.register(self.task_manager.close)
         self.cloud_sync = MongoDBCloudSync()
         self.auth_handler = get_auth_handler()
+        self._user_id = None
+
+        # Cloud writes run on one background thread so commands return after
+        # the local save; a single worker keeps them in submission order.
+        # close() drains it; concurrent.futures shuts it down before any
+        # atexit handler runs, so nothing may be submitted at exit.
+        self._sync_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cloud-sync")
+        self._last_sync: Optional[Future] = None
+
+        # Task changes waiting to be sent as one batch; later edits to the
+        # same task replace earlier ones
+        self._pending_upserts: Dict[str, Dict[str, Any]] = {}
+        self._pending_deletes: Dict[str, None] = {}
+        # Fires a flush PENDING_FLUSH_INTERVAL after the first buffered change
+        self._flush_timer: Optional[threading.Timer] = None
+        self._pending_lock = threading.Lock()
+        # Anything main() did not flush is sent at exit, on this thread
+        atexit.register(self._flush_pending)
+
+    def _get_user_id(self) -> str:
+        """Get the signed-in user's ID, looked up once until auth changes."""
+        if self._user_id is None:
+            self._user_id = (self.auth_handler.get_user_info() or {}).get('user_id', 'default')
+        return self._user_id
+
+    def _push_delta(self, upserts: Dict[str, Any] = None, deletes: List[str] = None) -> None:
+        """Buffer changed or deleted tasks, flushing when the batch is full or old enough."""
+        with self._pending_lock:
+            for task_id, task_data in (upserts or {}).items():
+                self._pending_deletes.pop(task_id, None)
+                self._pending_upserts[task_id] = task_data
+            for task_id in deletes or ():
+                self._pending_upserts.pop(task_id, None)
+                self._pending_deletes[task_id] = None
+            pending = len(self._pending_upserts) + len(self._pending_deletes)
+
+            if pending < PENDING_FLUSH_THRESHOLD and self._flush_timer is None:
+                self._flush_timer = threading.Timer(PENDING_FLUSH_INTERVAL, self._flush_pending)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+        if pending >= PENDING_FLUSH_THRESHOLD:
+            self._flush_pending()
+
+    def _flush_pending(self, wait: bool = False) -> None:
+        """Send buffered task changes to the cloud as one background update.
+
+        With wait, block until it and every update queued before it are done.
+        """
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            upserts, deletes = self._pending_upserts, list(self._pending_deletes)
+            self._pending_upserts, self._pending_deletes = {}, {}
+
+        if (upserts or deletes) and self.cloud_sync.is_connected():
+            send = partial(self.cloud_sync.apply_task_delta, upserts, deletes, self._get_user_id())
+            try:
+                self._last_sync = self._sync_pool.submit(send)
+            except RuntimeError:
+                # The pool is already shut down at interpreter exit
+                try:
+                    send()
+                except Exception as e:
+                    _report_sync_error(e)
+            else:
+                self._last_sync.add_done_callback(_report_sync_failure)
+
+        if wait and self._last_sync is not None:
+            # One worker runs updates in order, so the last finishing means all have
+            wait_for([self._last_sync])
+
+    def close(self) -> None:
+        """Send any buffered changes and wait for queued cloud updates to finish."""
+        self._flush_pending()
+        self._sync_pool.shutdown(wait=True)
 
     def add_task(self, title: str, description: str = None, priority: str = "medium",
                  tags: List[str] = None, due_date: str = None) -> None:
         """Add a new task."""
         try:
             # Validate priority
-            if not validate_priority(priority):
+            try:
+                priority_value = PRIORITY_BY_VALUE[priority.lower()]
+            except KeyError:
                 print_error(f"Invalid priority: {priority}. Use: low, medium, high")
                 return
 
@@ -58,7 +160,7 @@ class TaskCLI:
             task = self.task_manager.add_task(
                 title=title,
                 description=description,
-                priority=Priority(priority),
+                priority=priority_value,
                 tags=tags or [],
                 due_date=parsed_due_date
             )
@@ -66,39 +168,36 @@ class TaskCLI:
             print_success(f"Task added successfully: {task.title}")
 
             # Sync to cloud if connected
-            if self.cloud_sync.is_connected():
-                try:
-                    self.cloud_sync.sync_tasks_to_cloud(
-                        self.task_manager.export_tasks(),
-                        user_id=self.auth_handler.get_user_info().get('user_id', 'default')
-                    )
-                    print_info("Task synced to cloud")
-                except CloudSyncError as e:
-                    print_warning(f"Cloud sync failed: {e}")
+            self._push_delta(upserts={task.id: task.to_dict()})
 
         except Exception as e:
             print_error(f"Error adding task: {e}")
-            logger.error(f"Error adding task: {e}")
+            logger.error("Error adding task: %s", e)
 
     def list_tasks(self, status: str = None, priority: str = None, 
                    show_completed: bool = False) -> None:
         """List tasks with optional filtering."""
+        self._flush_pending()
         try:
-            tasks = self.task_manager.get_all_tasks()
-
-            # Filter by status
+            # Start from the status index when filtering by status
             if status:
-                if not validate_status(status):
+                try:
+                    status_value = STATUS_BY_VALUE[status.lower()]
+                except KeyError:
                     print_error(f"Invalid status: {status}")
                     return
-                tasks = [task for task in tasks if task.status.value == status]
+                tasks = self.task_manager.get_tasks_by_status(status_value)
+            else:
+                tasks = self.task_manager.get_all_tasks()
 
             # Filter by priority
             if priority:
-                if not validate_priority(priority):
+                try:
+                    priority_value = PRIORITY_BY_VALUE[priority.lower()]
+                except KeyError:
                     print_error(f"Invalid priority: {priority}")
                     return
-                tasks = [task for task in tasks if task.priority.value == priority]
+                tasks = [task for task in tasks if task.priority is priority_value]
 
             # Filter completed tasks
             if not show_completed:
@@ -108,14 +207,13 @@ class TaskCLI:
                 print_info("No tasks found")
                 return
 
-            # Convert to dict format for display
-            task_dicts = [task.to_dict() for task in tasks]
-            table = create_task_table(task_dicts)
+            # Convert to dict format for display, one row at a time
+            table = create_task_table(task.to_dict() for task in tasks)
             console.print(table)
 
         except Exception as e:
             print_error(f"Error listing tasks: {e}")
-            logger.error(f"Error listing tasks: {e}")
+            logger.error("Error listing tasks: %s", e)
 
     def complete_task(self, task_id: str) -> None:
         """Mark a task as completed."""
@@ -125,21 +223,13 @@ class TaskCLI:
                 print_success(f"Task completed: {task.title}")
 
                 # Sync to cloud if connected
-                if self.cloud_sync.is_connected():
-                    try:
-                        self.cloud_sync.sync_tasks_to_cloud(
-                            self.task_manager.export_tasks(),
-                            user_id=self.auth_handler.get_user_info().get('user_id', 'default')
-                        )
-                        print_info("Task sync updated in cloud")
-                    except CloudSyncError as e:
-                        print_warning(f"Cloud sync failed: {e}")
+                self._push_delta(upserts={task.id: task.to_dict()})
             else:
                 print_error(f"Task {task_id} not found")
 
         except Exception as e:
             print_error(f"Error completing task: {e}")
-            logger.error(f"Error completing task: {e}")
+            logger.error("Error completing task: %s", e)
 
     def delete_task(self, task_id: str) -> None:
         """Delete a task."""
@@ -149,33 +239,31 @@ class TaskCLI:
                     print_success(f"Task {task_id} deleted")
 
                     # Delete from cloud if connected
-                    if self.cloud_sync.is_connected():
-                        try:
-                            self.cloud_sync.delete_task_from_cloud(
-                                task_id,
-                                user_id=self.auth_handler.get_user_info().get('user_id', 'default')
-                            )
-                            print_info("Task deleted from cloud")
-                        except CloudSyncError as e:
-                            print_warning(f"Cloud delete failed: {e}")
+                    self._push_delta(deletes=[task_id])
                 else:
                     print_error(f"Task {task_id} not found")
 
         except Exception as e:
             print_error(f"Error deleting task: {e}")
-            logger.error(f"Error deleting task: {e}")
+            logger.error("Error deleting task: %s", e)
 
     def update_task(self, task_id: str, **kwargs) -> None:
         """Update a task."""
         try:
-            # Validate inputs
-            if 'priority' in kwargs and not validate_priority(kwargs['priority']):
-                print_error(f"Invalid priority: {kwargs['priority']}")
-                return
+            # Validate inputs, converting string values to enums
+            if 'priority' in kwargs:
+                try:
+                    kwargs['priority'] = PRIORITY_BY_VALUE[kwargs['priority'].lower()]
+                except KeyError:
+                    print_error(f"Invalid priority: {kwargs['priority']}")
+                    return
 
-            if 'status' in kwargs and not validate_status(kwargs['status']):
-                print_error(f"Invalid status: {kwargs['status']}")
-                return
+            if 'status' in kwargs:
+                try:
+                    kwargs['status'] = STATUS_BY_VALUE[kwargs['status'].lower()]
+                except KeyError:
+                    print_error(f"Invalid status: {kwargs['status']}")
+                    return
 
             if 'due_date' in kwargs and kwargs['due_date']:
                 parsed_date = parse_date(kwargs['due_date'])
@@ -184,52 +272,46 @@ class TaskCLI:
                     return
                 kwargs['due_date'] = parsed_date
 
-            # Convert string values to enums
-            if 'priority' in kwargs:
-                kwargs['priority'] = Priority(kwargs['priority'])
-            if 'status' in kwargs:
-                kwargs['status'] = TaskStatus(kwargs['status'])
-
             task = self.task_manager.update_task(task_id, **kwargs)
             if task:
                 print_success(f"Task updated: {task.title}")
 
                 # Sync to cloud if connected
-                if self.cloud_sync.is_connected():
-                    try:
-                        self.cloud_sync.sync_tasks_to_cloud(
-                            self.task_manager.export_tasks(),
-                            user_id=self.auth_handler.get_user_info().get('user_id', 'default')
-                        )
-                        print_info("Task sync updated in cloud")
-                    except CloudSyncError as e:
-                        print_warning(f"Cloud sync failed: {e}")
+                self._push_delta(upserts={task.id: task.to_dict()})
             else:
                 print_error(f"Task {task_id} not found")
 
         except Exception as e:
             print_error(f"Error updating task: {e}")
-            logger.error(f"Error updating task: {e}")
+            logger.error("Error updating task: %s", e)
 
     def show_statistics(self) -> None:
         """Show task statistics."""
+        self._flush_pending()
         try:
+            # Fetch cloud statistics on the sync worker, after any queued
+            # writes, while the local statistics are rendered
+            cloud_future = self._sync_pool.submit(self._fetch_cloud_statistics)
+
             stats = self.task_manager.get_task_statistics()
             panel = create_statistics_panel(stats)
             console.print(panel)
 
             # Show cloud statistics if connected
-            if self.cloud_sync.is_connected():
-                cloud_stats = self.cloud_sync.get_cloud_statistics(
-                    user_id=self.auth_handler.get_user_info().get('user_id', 'default')
-                )
-                if 'error' not in cloud_stats:
-                    print_info("Cloud statistics available")
-                    print(f"Cloud tasks by status: {cloud_stats}")
+            cloud_stats = cloud_future.result()
+            if cloud_stats is not None and 'error' not in cloud_stats:
+                print_info("Cloud statistics available")
+                print(f"Cloud tasks by status: {cloud_stats}")
 
         except Exception as e:
             print_error(f"Error showing statistics: {e}")
-            logger.error(f"Error showing statistics: {e}")
+            logger.error("Error showing statistics: %s", e)
+
+    def _fetch_cloud_statistics(self) -> Optional[Dict[str, Any]]:
+        """Get cloud task counts by status, or None when not connected."""
+        if not self.cloud_sync.is_connected():
+            return None
+        return self.cloud_sync.get_cloud_statistics(user_id=self._get_user_id())
 
     def search_tasks(self, query: str) -> None:
         """Search tasks by title, description, or tags."""
@@ -240,23 +322,25 @@ class TaskCLI:
                 print_info(f"No tasks found matching '{query}'")
                 return
 
-            # Convert to dict format for display
-            result_dicts = [task.to_dict() for task in results]
-            table = create_search_results_table(result_dicts, query)
+            # Convert to dict format for display, one row at a time
+            table = create_search_results_table((task.to_dict() for task in results), query)
             console.print(table)
 
         except Exception as e:
             print_error(f"Error searching tasks: {e}")
-            logger.error(f"Error searching tasks: {e}")
+            logger.error("Error searching tasks: %s", e)
 
     def sync_with_cloud(self, direction: str = "both") -> None:
         """Sync tasks with cloud database."""
+        # The full upload below must not race a queued delta for the same
+        # tasks, or both would apply the same counter changes
+        self._flush_pending(wait=True)
         try:
             if not self.cloud_sync.is_connected():
                 print_warning("Not connected to cloud database")
                 return
 
-            user_id = self.auth_handler.get_user_info().get('user_id', 'default')
+            user_id = self._get_user_id()
 
             if direction in ["up", "both"]:
                 print_info("Syncing local tasks to cloud...")
@@ -279,7 +363,7 @@ class TaskCLI:
             print_error(f"Cloud sync error: {e}")
         except Exception as e:
             print_error(f"Error syncing with cloud: {e}")
-            logger.error(f"Error syncing with cloud: {e}")
+            logger.error("Error syncing with cloud: %s", e)
 
     def show_cloud_health(self) -> None:
         """Show cloud database health status."""
@@ -290,11 +374,14 @@ class TaskCLI:
 
         except Exception as e:
             print_error(f"Error checking cloud health: {e}")
-            logger.error(f"Error checking cloud health: {e}")
+            logger.error("Error checking cloud health: %s", e)
 
     def authenticate(self) -> None:
         """Authenticate user."""
+        # Buffered edits belong to the user who made them
+        self._flush_pending()
         try:
+            self._user_id = None
             if self.auth_handler.authenticate():
                 user_info = self.auth_handler.get_user_info()
                 print_success(f"Authenticated as: {user_info.get('name', 'Unknown')}")
@@ -303,22 +390,120 @@ class TaskCLI:
 
         except Exception as e:
             print_error(f"Authentication error: {e}")
-            logger.error(f"Authentication error: {e}")
+            logger.error("Authentication error: %s", e)
 
     def logout(self) -> None:
         """Logout user."""
+        self._flush_pending()
         try:
             self.auth_handler.logout()
+            self._user_id = None
             print_success("Logged out successfully")
 
         except Exception as e:
             print_error(f"Logout error: {e}")
-            logger.error(f"Logout error: {e}")
+            logger.error("Logout error: %s", e)
 
 
-def main():
-    """Main CLI entry point."""
-    parser = argparse.ArgumentParser(
+class TaskArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that reuses one formatter to validate added arguments."""
+
+    _validation_formatter = None
+    _adding_argument = False
+
+    def add_argument(self, *args, **kwargs):
+        # add_argument only builds a formatter to check the metavar can be
+        # rendered, and each new one re-reads the terminal size
+        self._adding_argument = True
+        try:
+            return super().add_argument(*args, **kwargs)
+        finally:
+            self._adding_argument = False
+
+    def _get_formatter(self):
+        # Formatters accumulate state while rendering help, so only the
+        # validation path shares one
+        if not self._adding_argument:
+            return super()._get_formatter()
+        if self._validation_formatter is None:
+            self._validation_formatter = super()._get_formatter()
+        return self._validation_formatter
+
+
+def _add_add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the add command's arguments."""
+    parser.add_argument('title', help='Task title')
+    parser.add_argument('--description', '-d', help='Task description')
+    parser.add_argument('--priority', '-p', choices=['low', 'medium', 'high'],
+                        default='medium', help='Task priority')
+    parser.add_argument('--tags', '-t', nargs='+', help='Task tags')
+    parser.add_argument('--due-date', help='Due date (YYYY-MM-DD)')
+
+
+def _add_list_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the list command's arguments."""
+    parser.add_argument('--status', '-s', choices=['pending', 'in_progress', 'completed', 'cancelled'],
+                        help='Filter by status')
+    parser.add_argument('--priority', '-p', choices=['low', 'medium', 'high'],
+                        help='Filter by priority')
+    parser.add_argument('--show-completed', action='store_true',
+                        help='Show completed tasks')
+
+
+def _add_complete_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the complete command's arguments."""
+    parser.add_argument('task_id', help='Task ID to complete')
+
+
+def _add_delete_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the delete command's arguments."""
+    parser.add_argument('task_id', help='Task ID to delete')
+
+
+def _add_update_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the update command's arguments."""
+    parser.add_argument('task_id', help='Task ID to update')
+    parser.add_argument('--title', help='New task title')
+    parser.add_argument('--description', help='New task description')
+    parser.add_argument('--priority', choices=['low', 'medium', 'high'],
+                        help='New task priority')
+    parser.add_argument('--status', choices=['pending', 'in_progress', 'completed', 'cancelled'],
+                        help='New task status')
+    parser.add_argument('--tags', nargs='+', help='New task tags')
+    parser.add_argument('--due-date', help='New due date (YYYY-MM-DD)')
+
+
+def _add_search_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the search command's arguments."""
+    parser.add_argument('query', help='Search query')
+
+
+def _add_sync_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the sync command's arguments."""
+    parser.add_argument('--direction', choices=['up', 'down', 'both'],
+                        default='both', help='Sync direction')
+
+
+# Subcommand -> (help text, function adding its arguments)
+SUBCOMMANDS = {
+    'add': ('Add a new task', _add_add_arguments),
+    'list': ('List tasks', _add_list_arguments),
+    'complete': ('Mark task as completed', _add_complete_arguments),
+    'delete': ('Delete a task', _add_delete_arguments),
+    'update': ('Update a task', _add_update_arguments),
+    'stats': ('Show task statistics', None),
+    'search': ('Search tasks', _add_search_arguments),
+    'sync': ('Sync with cloud database', _add_sync_arguments),
+    'health': ('Show cloud database health', None),
+    'auth': ('Authenticate user', None),
+    'logout': ('Logout user', None),
+    'interactive': ('Start interactive mode', None),
+}
+
+
+def build_parser(command: str = None) -> argparse.ArgumentParser:
+    """Build the CLI parser, with only the given subcommand when it is known."""
+    parser = TaskArgumentParser(
         description="Task Reminder CLI Tool with Cloud Sync",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
@@ -334,66 +519,21 @@ Examples:
 
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
-    # Add task command
-    add_parser = subparsers.add_parser('add', help='Add a new task')
-    add_parser.add_argument('title', help='Task title')
-    add_parser.add_argument('--description', '-d', help='Task description')
-    add_parser.add_argument('--priority', '-p', choices=['low', 'medium', 'high'],
-                           default='medium', help='Task priority')
-    add_parser.add_argument('--tags', '-t', nargs='+', help='Task tags')
-    add_parser.add_argument('--due-date', help='Due date (YYYY-MM-DD)')
-
-    # List tasks command
-    list_parser = subparsers.add_parser('list', help='List tasks')
-    list_parser.add_argument('--status', '-s', choices=['pending', 'in_progress', 'completed', 'cancelled'],
-                            help='Filter by status')
-    list_parser.add_argument('--priority', '-p', choices=['low', 'medium', 'high'],
-                            help='Filter by priority')
-    list_parser.add_argument('--show-completed', action='store_true',
-                            help='Show completed tasks')
-
-    # Complete task command
-    complete_parser = subparsers.add_parser('complete', help='Mark task as completed')
-    complete_parser.add_argument('task_id', help='Task ID to complete')
-
-    # Delete task command
-    delete_parser = subparsers.add_parser('delete', help='Delete a task')
-    delete_parser.add_argument('task_id', help='Task ID to delete')
-
-    # Update task command
-    update_parser = subparsers.add_parser('update', help='Update a task')
-    update_parser.add_argument('task_id', help='Task ID to update')
-    update_parser.add_argument('--title', help='New task title')
-    update_parser.add_argument('--description', help='New task description')
-    update_parser.add_argument('--priority', choices=['low', 'medium', 'high'],
-                              help='New task priority')
-    update_parser.add_argument('--status', choices=['pending', 'in_progress', 'completed', 'cancelled'],
-                              help='New task status')
-    update_parser.add_argument('--tags', nargs='+', help='New task tags')
-    update_parser.add_argument('--due-date', help='New due date (YYYY-MM-DD)')
-
-    # Statistics command
-    subparsers.add_parser('stats', help='Show task statistics')
-
-    # Search command
-    search_parser = subparsers.add_parser('search', help='Search tasks')
-    search_parser.add_argument('query', help='Search query')
-
-    # Sync command
-    sync_parser = subparsers.add_parser('sync', help='Sync with cloud database')
-    sync_parser.add_argument('--direction', choices=['up', 'down', 'both'],
-                            default='both', help='Sync direction')
-
-    # Cloud health command
-    subparsers.add_parser('health', help='Show cloud database health')
-
-    # Authentication commands
-    subparsers.add_parser('auth', help='Authenticate user')
-    subparsers.add_parser('logout', help='Logout user')
-
-    # Interactive mode
-    subparsers.add_parser('interactive', help='Start interactive mode')
+    # Top-level help and unknown commands need every subcommand listed
+    names = [command] if command in SUBCOMMANDS else SUBCOMMANDS
+    for name in names:
+        help_text, add_arguments = SUBCOMMANDS[name]
+        subparser = subparsers.add_parser(name, help=help_text)
+        if add_arguments:
+            add_arguments(subparser)
 
+    return parser
+
+
+def main():
+    """Main CLI entry point."""
+    # The subcommand is always the first argument, so only its parser is built
+    parser = build_parser(sys.argv[1] if len(sys.argv) > 1 else None)
     args = parser.parse_args()
 
     if not args.command:
@@ -468,24 +608,15 @@ Examples:
         sys.exit(0)
     except Exception as e:
         print_error(f"Unexpected error: {e}")
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         sys.exit(1)
+    finally:
+        # One-shot commands never fill the buffer, so deliver it and wait for
+        # the pool here rather than relying on interpreter exit
+        cli.close()
 
 
-def run_interactive_mode(cli: TaskCLI):
-    """Run interactive mode for task management."""
-    print("Welcome to Task Reminder CLI Interactive Mode!")
-    print("Type 'help' for available commands, 'quit' to exit.")
-
-    while True:
-        try:
-            command = input("\n> ").strip().lower()
-            
-            if command == 'quit' or command == 'exit':
-                print("Goodbye!")
-                break
-            elif command == 'help':
-                print("""
+INTERACTIVE_HELP = """
 Available commands:
   add <title> - Add a new task
   list - List all tasks
@@ -498,52 +629,86 @@ Available commands:
   auth - Authenticate
   logout - Logout
   quit - Exit
-                """)
-            elif command.startswith('add '):
-                title = command[4:].strip()
-                if title:
-                    cli.add_task(title)
-                else:
-                    print_error("Please provide a task title")
-            elif command == 'list':
-                cli.list_tasks()
-            elif command.startswith('complete '):
-                task_id = command[9:].strip()
-                if task_id:
-                    cli.complete_task(task_id)
-                else:
-                    print_error("Please provide a task ID")
-            elif command.startswith('delete '):
-                task_id = command[7:].strip()
-                if task_id:
-                    cli.delete_task(task_id)
-                else:
-                    print_error("Please provide a task ID")
-            elif command == 'stats':
-                cli.show_statistics()
-            elif command.startswith('search '):
-                query = command[7:].strip()
-                if query:
-                    cli.search_tasks(query)
-                else:
-                    print_error("Please provide a search query")
-            elif command == 'sync':
-                cli.sync_with_cloud()
-            elif command == 'health':
-                cli.show_cloud_health()
-            elif command == 'auth':
-                cli.authenticate()
-            elif command == 'logout':
-                cli.logout()
-            else:
+                """
+
+
+def _enable_line_editing(words: List[str]) -> None:
+    """Turn on input history and tab completion of command names, where readline exists."""
+    try:
+        import readline
+    except ImportError:  # Not available on Windows
+        return
+
+    def complete(text: str, state: int) -> Optional[str]:
+        matches = [word for word in words if word.startswith(text)]
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(complete)
+    readline.parse_and_bind('tab: complete')
+
+
+def run_interactive_mode(cli: TaskCLI):
+    """Run interactive mode for task management."""
+    print("Welcome to Task Reminder CLI Interactive Mode!")
+    print("Type 'help' for available commands, 'quit' to exit.")
+
+    # Command -> (handler, error shown when its argument is missing, or None
+    # for commands that take no argument)
+    commands = {
+        'add': (cli.add_task, "Please provide a task title"),
+        'list': (cli.list_tasks, None),
+        'complete': (cli.complete_task, "Please provide a task ID"),
+        'delete': (cli.delete_task, "Please provide a task ID"),
+        'stats': (cli.show_statistics, None),
+        'search': (cli.search_tasks, "Please provide a search query"),
+        'sync': (cli.sync_with_cloud, None),
+        'health': (cli.show_cloud_health, None),
+        'auth': (cli.authenticate, None),
+        'logout': (cli.logout, None),
+    }
+    _enable_line_editing([*commands, 'help', 'quit', 'exit'])
+
+    # Long-lived session: follow cloud changes instead of rescanning on every sync
+    if cli.cloud_sync.is_connected():
+        cli.cloud_sync.start_change_stream(user_id=cli._get_user_id())
+
+    while True:
+        try:
+            # Only the command name is split off, so titles keep their case,
+            # apostrophes and spacing
+            name, _, argument = input("\n> ").strip().partition(' ')
+            if not name:
+                continue
+            name, argument = name.lower(), argument.strip()
+
+            if name == 'quit' or name == 'exit':
+                print("Goodbye!")
+                break
+            elif name == 'help':
+                print(INTERACTIVE_HELP)
+                continue
+
+            try:
+                handler, missing_argument = commands[name]
+            except KeyError:
                 print_error("Unknown command. Type 'help' for available commands.")
+                continue
+
+            if missing_argument is None:
+                handler()
+            elif argument:
+                handler(argument)
+            else:
+                print_error(missing_argument)
 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             print("\nExiting interactive mode...")
             break
         except Exception as e:
             print_error(f"Error: {e}")
 
+    cli.cloud_sync.stop_change_stream()
+
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
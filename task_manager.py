@@ -7,14 +7,59 @@ Provides CRUD operations for tasks with offline support.
 
 import json
 import os
+import re
+import sys
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Set
+from dataclasses import dataclass
 from enum import Enum
 import logging
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is the fallback
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Optional; large snapshots are then parsed in one go
+    ijson = None
+
 logger = logging.getLogger(__name__)
 
+# db_path that keeps tasks in memory only, never touching the filesystem
+MEMORY_DB_PATH = ':memory:'
+
+# Snapshot key holding manager state rather than a task
+META_KEY = '_meta'
+
+# The snapshot is rewritten once the change log outgrows it by this factor
+# (and is at least COMPACT_MIN_LOG_BYTES), folding the log back in
+COMPACT_LOG_RATIO = 4
+COMPACT_MIN_LOG_BYTES = 64 * 1024
+
+# Snapshots at least this large are stream-parsed with ijson when available
+STREAM_THRESHOLD_BYTES = 64 * 1024
+
+# TaskManager attributes filled in by _load_tasks on first access
+_LAZY_STATE = frozenset(('tasks', '_next_id', '_generation', '_by_status', '_by_priority', '_token_index', '_task_tokens'))
+
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def _dumps(data: Any, indent: bool = False) -> bytes:
+    """Encode data as UTF-8 JSON, optionally indented by two spaces."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """Decode UTF-8 JSON bytes."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
 
 class Priority(Enum):
     """Task priority levels."""
@@ -31,7 +76,13 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+# Plain dict lookups skip Enum.__call__, which is slow when loading many tasks
+PRIORITY_BY_VALUE: Dict[str, Priority] = {priority.value: priority for priority in Priority}
+STATUS_BY_VALUE: Dict[str, TaskStatus] = {status.value: status for status in TaskStatus}
+
+
+# Slots drop the per-instance __dict__; dataclass only supports them from 3.10
+@dataclass(**({'slots': True} if sys.version_info >= (3, 10) else {}))
 class Task:
     """Task data structure."""
     id: str
@@ -55,60 +106,288 @@ class Task:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert task to dictionary for JSON serialization."""
-        task_dict = asdict(self)
-        task_dict['priority'] = self.priority.value
-        task_dict['status'] = self.status.value
-        return task_dict
+        # Built by hand: asdict() deep-copies every field recursively
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'priority': self.priority.value,
+            'status': self.status.value,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'completed_at': self.completed_at,
+            'tags': list(self.tags),
+            'due_date': self.due_date,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Task':
         """Create task from dictionary."""
-        data['priority'] = Priority(data['priority'])
-        data['status'] = TaskStatus(data['status'])
+        try:
+            data['priority'] = PRIORITY_BY_VALUE[data['priority']]
+            data['status'] = STATUS_BY_VALUE[data['status']]
+        except KeyError as e:
+            raise ValueError(f"Invalid task value: {e}") from None
         return cls(**data)
 
 
+def _search_tokens(task: 'Task') -> Set[str]:
+    """Lowercased words in a task's title, description and tags."""
+    tokens = set(_WORD_RE.findall(task.title.lower()))
+    if task.description:
+        tokens.update(_WORD_RE.findall(task.description.lower()))
+    for tag in task.tags:
+        tokens.update(_WORD_RE.findall(tag.lower()))
+    return tokens
+
+
+def _matches_query(task: 'Task', query_lower: str) -> bool:
+    """Check whether a lowercased query occurs in a task's title, description or tags."""
+    return (query_lower in task.title.lower() or
+            (task.description and query_lower in task.description.lower()) or
+            any(query_lower in tag.lower() for tag in task.tags))
+
+
 class TaskManager:
     """Manages local task storage and operations."""
 
+    # Loaded from disk on first access (see __getattr__), so commands that
+    # never touch tasks don't pay for reading them
+    tasks: Dict[str, Task]
+    # Never reused, so a deleted task's ID can't be handed out again
+    _next_id: int
+    # Bumped by each compaction; log entries from older snapshots are skipped
+    _generation: int
+    # Task IDs per status and priority; dicts keep them in insertion order
+    _by_status: Dict[TaskStatus, Dict[str, None]]
+    _by_priority: Dict[Priority, Dict[str, None]]
+    # Search word -> task IDs, and each task's words so they can be removed
+    _token_index: Dict[str, Set[str]]
+    _task_tokens: Dict[str, Set[str]]
+
     def __init__(self, db_path: str = "./tasks.json"):
         self.db_path = db_path
-        self.tasks: Dict[str, Task] = {}
+        self.in_memory = db_path == MEMORY_DB_PATH
+        # Changes since the last snapshot, one JSON line per upsert or delete
+        self.log_path = f"{db_path}.log"
+        self._log_file = None
+        self._log_size = 0
+        self._snapshot_size = 0
+        # IDs changed inside batch(), logged together when it exits
+        self._batch_ids: Optional[Dict[str, None]] = None
+
+    def __getattr__(self, name: str) -> Any:
+        """Load the task state the first time any part of it is read."""
+        if name not in _LAZY_STATE:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
         self._load_tasks()
+        return self.__dict__[name]
 
     def _load_tasks(self) -> None:
-        """Load tasks from JSON file."""
+        """Load tasks from the JSON snapshot, then replay the change log."""
+        self.tasks = {}
+        self._next_id = 1
+        self._generation = 0
+        if self.in_memory:
+            self._rebuild_indexes()
+            return
         try:
             if os.path.exists(self.db_path):
-                with open(self.db_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.tasks = {
-                        task_id: Task.from_dict(task_data)
-                        for task_id, task_data in data.items()
-                    }
-                logger.info(f"Loaded {len(self.tasks)} tasks from {self.db_path}")
+                self._snapshot_size = os.path.getsize(self.db_path)
+                with open(self.db_path, 'rb') as f:
+                    if ijson and self._snapshot_size >= STREAM_THRESHOLD_BYTES:
+                        # Build tasks as entries are parsed, without holding
+                        # the whole decoded document as well
+                        items = ijson.kvitems(f, '')
+                    else:
+                        items = _loads(f.read()).items()
+                    for task_id, task_data in items:
+                        if task_id == META_KEY:
+                            self._next_id = task_data.get('next_id', 1)
+                            self._generation = task_data.get('generation', 0)
+                        else:
+                            self.tasks[task_id] = Task.from_dict(task_data)
+                logger.info("Loaded %d tasks from %s", len(self.tasks), self.db_path)
             else:
-                logger.info(f"No existing task file found at {self.db_path}")
+                logger.info("No existing task file found at %s", self.db_path)
+            self._replay_log()
         except Exception as e:
-            logger.error(f"Error loading tasks: {e}")
+            logger.error("Error loading tasks: %s", e)
             self.tasks = {}
-
-    def _save_tasks(self) -> None:
-        """Save tasks to JSON file."""
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the status, priority and search indexes from self.tasks."""
+        self._by_status = {status: {} for status in TaskStatus}
+        self._by_priority = {priority: {} for priority in Priority}
+        self._token_index = {}
+        self._task_tokens = {}
+        for task_id, task in self.tasks.items():
+            self._note_task_id(task_id)
+            self._index_task(task_id, task)
+
+    def _note_task_id(self, task_id: str) -> None:
+        """Keep generated IDs above an existing numeric task ID."""
+        if task_id.isdigit():
+            self._next_id = max(self._next_id, int(task_id) + 1)
+
+    def _index_task(self, task_id: str, task: Task) -> None:
+        """Add a task to the status, priority and search indexes."""
+        self._by_status[task.status][task_id] = None
+        self._by_priority[task.priority][task_id] = None
+
+        tokens = _search_tokens(task)
+        self._task_tokens[task_id] = tokens
+        for token in tokens:
+            self._token_index.setdefault(token, set()).add(task_id)
+
+    def _put_task(self, task_id: str, task: Task) -> None:
+        """Store a task, replacing any task with the same ID in the indexes."""
+        replaced = self.tasks.get(task_id)
+        if replaced is not None:
+            self._unindex_task(task_id, replaced)
+        self.tasks[task_id] = task
+        self._note_task_id(task_id)
+        self._index_task(task_id, task)
+
+    def _unindex_task(self, task_id: str, task: Task) -> None:
+        """Remove a task from the status, priority and search indexes."""
+        self._by_status[task.status].pop(task_id, None)
+        self._by_priority[task.priority].pop(task_id, None)
+
+        for token in self._task_tokens.pop(task_id, ()):
+            task_ids = self._token_index[token]
+            task_ids.discard(task_id)
+            if not task_ids:
+                del self._token_index[token]
+
+    def _replay_log(self) -> None:
+        """Apply the change log written since the last snapshot."""
+        if not os.path.exists(self.log_path):
+            return
+
+        replayed = 0
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = _loads(line)
+                    if entry.get('gen', 0) < self._generation:
+                        # Left over from a crash mid-compaction; already in the snapshot
+                        continue
+                    # Deleted IDs count too, so they are never handed out again
+                    self._note_task_id(entry['id'])
+                    if entry['op'] == 'delete':
+                        self.tasks.pop(entry['id'], None)
+                    else:
+                        self.tasks[entry['id']] = Task.from_dict(entry['task'])
+                    replayed += 1
+                except (ValueError, KeyError, TypeError) as e:
+                    # A torn final line from a crash mid-append
+                    logger.warning("Skipping unreadable task log entry: %s", e)
+        self._log_size = os.path.getsize(self.log_path)
+        if replayed:
+            logger.info("Replayed %d changes from %s", replayed, self.log_path)
+
+    def _ensure_directory(self) -> None:
+        """Create the directory holding the task files, if it has one."""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _log_entry(self, task_id: str) -> Dict[str, Any]:
+        """Build the change-log entry for a task's current state."""
+        task = self.tasks.get(task_id)
+        if task is None:
+            return {'op': 'delete', 'id': task_id, 'gen': self._generation}
+        return {'op': 'upsert', 'id': task_id, 'task': task.to_dict(), 'gen': self._generation}
+
+    def _save_tasks(self, *task_ids: str) -> None:
+        """Append the given tasks' current state (deleted if gone) to the change log."""
+        if self.in_memory:
+            return
+        if self._batch_ids is not None:
+            self._batch_ids.update(dict.fromkeys(task_ids))
+            return
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-            
-            with open(self.db_path, 'w', encoding='utf-8') as f:
-                json.dump(
-                    {task_id: task.to_dict() for task_id, task in self.tasks.items()},
-                    f, indent=2, ensure_ascii=False
-                )
-            logger.info(f"Saved {len(self.tasks)} tasks to {self.db_path}")
+            if self._log_file is None:
+                self._ensure_directory()
+                self._log_file = open(self.log_path, 'ab')
+
+            payload = b'\n'.join([_dumps(self._log_entry(task_id)) for task_id in task_ids]) + b'\n'
+
+            self._log_file.write(payload)
+            self._log_file.flush()
+            self._log_size += len(payload)
+            logger.debug("Logged %d task changes to %s", len(task_ids), self.log_path)
+
+            if self._log_size > max(COMPACT_LOG_RATIO * self._snapshot_size, COMPACT_MIN_LOG_BYTES):
+                self._compact()
         except Exception as e:
-            logger.error(f"Error saving tasks: {e}")
+            logger.error("Error saving tasks: %s", e)
             raise
 
+    def _compact(self) -> None:
+        """Rewrite the JSON snapshot from memory and start an empty change log."""
+        if self.in_memory:
+            return
+        self._ensure_directory()
+
+        # Swap the snapshot in atomically. It carries a new generation, so if
+        # we crash before removing the old log (or another process appends to
+        # it), its entries are skipped on load instead of undoing e.g. an import.
+        generation = self._generation + 1
+        tmp_path = f"{self.db_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            snapshot = {task_id: task.to_dict() for task_id, task in self.tasks.items()}
+            snapshot[META_KEY] = {'next_id': self._next_id, 'generation': generation}
+            f.write(_dumps(snapshot, indent=True))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.db_path)
+        self._snapshot_size = os.path.getsize(self.db_path)
+        self._generation = generation
+
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self._log_size = 0
+        if self._batch_ids:
+            # Already part of the new snapshot
+            self._batch_ids.clear()
+        logger.info("Saved %d tasks to %s", len(self.tasks), self.db_path)
+
+    def reload(self) -> None:
+        """Discard in-memory state and load the tasks again from disk."""
+        self.close()
+        self._log_size = 0
+        self._snapshot_size = 0
+        self._load_tasks()
+
+    @contextmanager
+    def batch(self) -> Iterator['TaskManager']:
+        """Group changes so they reach the change log in a single write on exit."""
+        if self._batch_ids is not None:
+            # Nested: the outermost batch writes everything
+            yield self
+            return
+        self._batch_ids = {}
+        try:
+            yield self
+        finally:
+            task_ids, self._batch_ids = self._batch_ids, None
+            if task_ids:
+                self._save_tasks(*task_ids)
+
+    def close(self) -> None:
+        """Flush the change log to disk and close it."""
+        if self._log_file is not None:
+            self._log_file.flush()
+            os.fsync(self._log_file.fileno())
+            self._log_file.close()
+            self._log_file = None
+
     def add_task(
         self,
         title: str,
@@ -118,7 +397,7 @@ class TaskManager:
         due_date: Optional[str] = None
     ) -> Task:
         """Add a new task."""
-        task_id = str(len(self.tasks) + 1)
+        task_id = str(self._next_id)
         task = Task(
             id=task_id,
             title=title,
@@ -128,9 +407,9 @@ class TaskManager:
             due_date=due_date
         )
         
-        self.tasks[task_id] = task
-        self._save_tasks()
-        logger.info(f"Added task: {title}")
+        self._put_task(task_id, task)
+        self._save_tasks(task_id)
+        logger.debug("Added task: %s", title)
         return task
 
     def get_task(self, task_id: str) -> Optional[Task]:
@@ -143,11 +422,16 @@ class TaskManager:
 
     def get_tasks_by_status(self, status: TaskStatus) -> List[Task]:
         """Get tasks filtered by status."""
-        return [task for task in self.tasks.values() if task.status == status]
+        return self._tasks_by_creation(self._by_status[status])
 
     def get_tasks_by_priority(self, priority: Priority) -> List[Task]:
         """Get tasks filtered by priority."""
-        return [task for task in self.tasks.values() if task.priority == priority]
+        return self._tasks_by_creation(self._by_priority[priority])
+
+    def _tasks_by_creation(self, task_ids: Iterable[str]) -> List[Task]:
+        """Look up indexed task IDs, oldest first."""
+        # Buckets are in the order tasks entered them, e.g. the order they were completed
+        return sorted((self.tasks[task_id] for task_id in task_ids), key=lambda task: task.created_at)
 
     def update_task(
         self,
@@ -162,9 +446,16 @@ class TaskManager:
         """Update an existing task."""
         task = self.tasks.get(task_id)
         if not task:
-            logger.warning(f"Task {task_id} not found")
+            logger.warning("Task %s not found", task_id)
             return None
 
+        # One timestamp per update, so completed_at and updated_at agree
+        now = datetime.now(timezone.utc).isoformat()
+
+        # Everything but the due date feeds an index
+        reindex = any(value is not None for value in (title, description, priority, status, tags))
+        if reindex:
+            self._unindex_task(task_id, task)
         if title is not None:
             task.title = title
         if description is not None:
@@ -174,15 +465,17 @@ class TaskManager:
         if status is not None:
             task.status = status
             if status == TaskStatus.COMPLETED and task.completed_at is None:
-                task.completed_at = datetime.now(timezone.utc).isoformat()
+                task.completed_at = now
         if tags is not None:
             task.tags = tags
         if due_date is not None:
             task.due_date = due_date
 
-        task.updated_at = datetime.now(timezone.utc).isoformat()
-        self._save_tasks()
-        logger.info(f"Updated task {task_id}")
+        task.updated_at = now
+        if reindex:
+            self._index_task(task_id, task)
+        self._save_tasks(task_id)
+        logger.debug("Updated task %s", task_id)
         return task
 
     def complete_task(self, task_id: str) -> Optional[Task]:
@@ -192,12 +485,13 @@ class TaskManager:
     def delete_task(self, task_id: str) -> bool:
         """Delete a task."""
         if task_id in self.tasks:
-            task_title = self.tasks[task_id].title
-            del self.tasks[task_id]
-            self._save_tasks()
-            logger.info(f"Deleted task: {task_title}")
+            task = self.tasks.pop(task_id)
+            task_title = task.title
+            self._unindex_task(task_id, task)
+            self._save_tasks(task_id)
+            logger.debug("Deleted task: %s", task_title)
             return True
-        logger.warning(f"Task {task_id} not found for deletion")
+        logger.warning("Task %s not found for deletion", task_id)
         return False
 
     def get_task_statistics(self) -> Dict[str, Any]:
@@ -213,18 +507,18 @@ class TaskManager:
                 "by_status": {}
             }
 
-        completed_tasks = len(self.get_tasks_by_status(TaskStatus.COMPLETED))
-        pending_tasks = len(self.get_tasks_by_status(TaskStatus.PENDING))
+        completed_tasks = len(self._by_status[TaskStatus.COMPLETED])
+        pending_tasks = len(self._by_status[TaskStatus.PENDING])
         
         # Group by priority
-        by_priority = {}
-        for priority in Priority:
-            by_priority[priority.value] = len(self.get_tasks_by_priority(priority))
+        by_priority = {
+            priority.value: len(task_ids) for priority, task_ids in self._by_priority.items()
+        }
 
         # Group by status
-        by_status = {}
-        for status in TaskStatus:
-            by_status[status.value] = len(self.get_tasks_by_status(status))
+        by_status = {
+            status.value: len(task_ids) for status, task_ids in self._by_status.items()
+        }
 
         return {
             "total": total_tasks,
@@ -238,14 +532,26 @@ class TaskManager:
     def search_tasks(self, query: str) -> List[Task]:
         """Search tasks by title or description."""
         query_lower = query.lower()
-        results = []
-        
-        for task in self.tasks.values():
-            if (query_lower in task.title.lower() or
-                (task.description and query_lower in task.description.lower()) or
-                any(query_lower in tag.lower() for tag in task.tags)):
-                results.append(task)
-        
+        query_tokens = set(_WORD_RE.findall(query_lower))
+        if not query_tokens:
+            # Only punctuation or whitespace: nothing to look up, scan everything
+            return [task for task in self.tasks.values() if _matches_query(task, query_lower)]
+
+        # Each word of a matching query lies inside one indexed word, so scan
+        # the vocabulary for candidates and confirm them with the full check
+        candidates = None
+        for query_token in query_tokens:
+            matching_ids = set()
+            for token, task_ids in self._token_index.items():
+                if query_token in token:
+                    matching_ids.update(task_ids)
+            candidates = matching_ids if candidates is None else candidates & matching_ids
+            if not candidates:
+                return []
+
+        results = [self.tasks[task_id] for task_id in candidates
+                   if _matches_query(self.tasks[task_id], query_lower)]
+        results.sort(key=lambda task: task.created_at)
         return results
 
     def export_tasks(self) -> Dict[str, Any]:
@@ -257,12 +563,15 @@ class TaskManager:
 
     def import_tasks(self, tasks_data: Dict[str, Any]) -> None:
         """Import tasks from cloud sync."""
+        # Parse and index in one pass, touching only the imported tasks' index entries
         for task_id, task_data in tasks_data.items():
             try:
                 task = Task.from_dict(task_data)
-                self.tasks[task_id] = task
             except Exception as e:
-                logger.error(f"Error importing task {task_id}: {e}")
+                logger.error("Error importing task %s: %s", task_id, e)
+                continue
+            self._put_task(task_id, task)
         
-        self._save_tasks()
-        logger.info(f"Imported {len(tasks_data)} tasks from cloud") 
\ No newline at end of file
+        # A bulk import rewrites the snapshot rather than logging every task
+        self._compact()
+        logger.info("Imported %d tasks from cloud", len(tasks_data)) 
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+Shared pytest fixtures.
+"""
+
+import copy
+import shutil
+
+import pytest
+
+from task_manager import TaskManager, Priority
+
+
+@pytest.fixture(scope="session")
+def template_db(tmp_path_factory):
+    """Write an empty task database once per test session."""
+    path = tmp_path_factory.mktemp("template") / "tasks.json"
+    path.write_text('{}', encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def temp_db_path(template_db, tmp_path):
+    """Copy the template database into this test's temporary directory."""
+    path = tmp_path / "tasks.json"
+    shutil.copyfile(template_db, path)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def sample_tasks_template():
+    """Build Task 1 (high, completed), Task 2 (medium) and Task 3 (low) once per session."""
+    manager = TaskManager(db_path=":memory:")
+    manager.add_task("Task 1", priority=Priority.HIGH)
+    manager.add_task("Task 2", priority=Priority.MEDIUM)
+    manager.add_task("Task 3", priority=Priority.LOW)
+    manager.complete_task("1")
+    return manager.export_tasks()
+
+
+@pytest.fixture
+def sample_tasks(sample_tasks_template):
+    """Give each test its own copy of the shared dataset to import."""
+    return copy.deepcopy(sample_tasks_template)
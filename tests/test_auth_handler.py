@@ -0,0 +1,206 @@
+"""
+Unit tests for Auth Handler module, against a fake Auth0 tenant.
+"""
+
+import base64
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from authlib.jose import JsonWebKey, jwt
+
+import auth_handler
+from auth_handler import AuthHandler
+
+DOMAIN = "tenant.example.com"
+ISSUER = f"https://{DOMAIN}/"
+JWKS_URL = f"{ISSUER}.well-known/jwks.json"
+USERINFO_URL = f"{ISSUER}userinfo"
+
+
+@pytest.fixture(scope="session")
+def signing_key():
+    """Generate the tenant's RSA signing key once per session."""
+    return JsonWebKey.generate_key("RSA", 2048, is_private=True)
+
+
+def make_token(key, kid="k1", alg="RS256", **claims):
+    """Sign a token for the fake tenant; claims override the defaults."""
+    payload = {"iss": ISSUER, "sub": "user-1", "exp": int(time.time()) + 3600, **claims}
+    return jwt.encode({"alg": alg, "kid": kid}, payload, key).decode()
+
+
+def b64(data):
+    """Base64url-encode a JSON object without padding."""
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+class FakeClock:
+    """Stand-in for the time module with a movable monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.time = time.time
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive auth_handler's monotonic clock by hand."""
+    fake = FakeClock()
+    monkeypatch.setattr(auth_handler, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def handler(monkeypatch, tmp_path, signing_key, clock):
+    """Build an AuthHandler whose HTTP session serves a fake JWKS and /userinfo."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AUTH0_DOMAIN", DOMAIN)
+    monkeypatch.delenv("AUTH0_AUDIENCE", raising=False)
+    monkeypatch.setattr(auth_handler, "_JWKS_CACHE", {})
+    monkeypatch.setattr(auth_handler, "_TOKEN_CACHE", {})
+    monkeypatch.setattr(auth_handler, "_jwks_fetched_at", float("-inf"))
+
+    jwk = dict(signing_key.as_dict(is_private=False), kid="k1")
+    responses = {
+        JWKS_URL: SimpleNamespace(json=lambda: {"keys": [jwk]}, raise_for_status=lambda: None),
+        USERINFO_URL: SimpleNamespace(json=lambda: {"user_id": "user-1"}, raise_for_status=lambda: None),
+    }
+    handler = AuthHandler()
+    handler._session = MagicMock()
+    handler._session.get.side_effect = lambda url, **kwargs: responses[url]
+    return handler
+
+
+def requested(handler, url):
+    """Count the HTTP GETs the handler made to a URL."""
+    return [call.args[0] for call in handler._session.get.call_args_list].count(url)
+
+
+class TestLocalJwtValidation:
+    """Access tokens verified against the tenant's JWKS."""
+
+    def test_valid_token(self, handler, signing_key):
+        """A well-signed, unexpired token validates without calling /userinfo."""
+        handler.access_token = make_token(signing_key)
+
+        assert handler.validate_token()
+        assert handler.token_claims["sub"] == "user-1"
+        assert requested(handler, USERINFO_URL) == 0
+
+    def test_expired_token(self, handler, signing_key):
+        """An expired token is rejected."""
+        handler.access_token = make_token(signing_key, exp=int(time.time()) - 10)
+
+        assert not handler.validate_token()
+        assert handler.token_claims is None
+
+    def test_wrong_issuer(self, handler, signing_key):
+        """A token from another tenant is rejected."""
+        handler.access_token = make_token(signing_key, iss="https://evil.example.com/")
+
+        assert not handler.validate_token()
+
+    def test_hs256_token_rejected(self, handler):
+        """A token choosing HMAC is rejected rather than checked with the public key."""
+        handler.access_token = make_token(b"shared-secret", alg="HS256")
+
+        assert not handler.validate_token()
+        assert requested(handler, USERINFO_URL) == 0
+
+    def test_none_alg_token_rejected(self, handler):
+        """An unsigned token is rejected."""
+        header = b64({"alg": "none", "kid": "k1"})
+        claims = b64({"iss": ISSUER, "sub": "user-1", "exp": int(time.time()) + 3600})
+        handler.access_token = f"{header}.{claims}."
+
+        assert not handler.validate_token()
+        assert requested(handler, USERINFO_URL) == 0
+
+    def test_unknown_kid_rejected(self, handler, signing_key):
+        """A token signed under an unknown kid is rejected."""
+        handler.access_token = make_token(signing_key, kid="other")
+
+        assert not handler.validate_token()
+
+
+class TestJwksCache:
+    """Signing keys cached by kid."""
+
+    def test_keys_fetched_once(self, handler, signing_key):
+        """Later tokens with a known kid reuse the parsed key."""
+        for _ in range(3):
+            handler.access_token = make_token(signing_key)
+            assert handler.validate_token()
+
+        assert requested(handler, JWKS_URL) == 1
+
+    def test_unknown_kid_refetch_is_rate_limited(self, handler, signing_key, clock):
+        """An unknown kid refetches the JWKS at most once per interval."""
+        handler.access_token = make_token(signing_key)
+        assert handler.validate_token()
+
+        handler.access_token = make_token(signing_key, kid="rotated")
+        assert not handler.validate_token()
+        assert not handler.validate_token()
+        assert requested(handler, JWKS_URL) == 1
+
+        clock.now += auth_handler.JWKS_REFETCH_INTERVAL
+        assert not handler.validate_token()
+        assert requested(handler, JWKS_URL) == 2
+
+
+class TestOpaqueTokens:
+    """Tokens only Auth0 can vouch for, checked through /userinfo."""
+
+    def test_opaque_token_uses_userinfo(self, handler):
+        """A token that isn't a JWT is validated by /userinfo."""
+        handler.access_token = "opaque-token"
+
+        assert handler.validate_token()
+        assert requested(handler, USERINFO_URL) == 1
+        assert requested(handler, JWKS_URL) == 0
+
+    def test_jwt_without_kid_falls_back(self, handler):
+        """A JWT-shaped token with no kid is treated as opaque."""
+        handler.access_token = f"{b64({'alg': 'dir', 'enc': 'A256GCM'})}.{b64({})}.sig"
+
+        assert handler.validate_token()
+        assert requested(handler, USERINFO_URL) == 1
+
+
+class TestUserInfoCache:
+    """/userinfo responses cached per token."""
+
+    def test_cache_hit_and_expiry(self, handler, clock):
+        """Repeat lookups are served from cache until the TTL passes."""
+        assert handler._get_user_info("opaque-token") == {"user_id": "user-1"}
+        assert handler._get_user_info("opaque-token") == {"user_id": "user-1"}
+        assert requested(handler, USERINFO_URL) == 1
+
+        clock.now += auth_handler.USERINFO_CACHE_DEFAULT_TTL
+        handler._get_user_info("opaque-token")
+        assert requested(handler, USERINFO_URL) == 2
+
+    def test_ttl_capped_by_token_expiry(self, handler, signing_key, clock):
+        """A JWT's cached info lives no longer than the token itself."""
+        token = make_token(signing_key, exp=int(time.time()) + 30)
+        handler._get_user_info(token)
+
+        clock.now += 31
+        handler._get_user_info(token)
+        assert requested(handler, USERINFO_URL) == 2
+
+    def test_logout_forgets_cached_info(self, handler):
+        """Logging out drops the token's cached info."""
+        handler.access_token = "opaque-token"
+        handler._get_user_info("opaque-token")
+        handler.logout()
+
+        handler._get_user_info("opaque-token")
+        assert requested(handler, USERINFO_URL) == 2
@@ -0,0 +1,250 @@
+"""
+Unit tests for Cloud Sync module, against mocked MongoDB collections.
+"""
+
+from collections import Counter
+from unittest.mock import MagicMock
+
+import pytest
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+from cloud_sync import MongoDBCloudSync
+
+
+@pytest.fixture
+def cloud(monkeypatch):
+    """Build a MongoDBCloudSync whose client and collections are mocks."""
+    monkeypatch.delenv("MONGODB_URI", raising=False)
+    cloud = MongoDBCloudSync()
+    cloud.client = MagicMock()
+    cloud.collection = MagicMock()
+    cloud.counts_collection = MagicMock()
+    cloud.state_collection = MagicMock()
+    # Counters already exist, so deltas are applied rather than rebuilt
+    cloud.counts_collection.count_documents.return_value = 1
+    return cloud
+
+
+def count_updates(cloud):
+    """Return the counter updates sent in the last counts bulk_write."""
+    return cloud.counts_collection.bulk_write.call_args.args[0]
+
+
+def inc(status, delta):
+    """Build the counter update for one status."""
+    return UpdateOne({"user_id": "u1", "status": status}, {"$inc": {"count": delta}}, upsert=True)
+
+
+class TestUpsertCounts:
+    """Counter deltas produced by upserts."""
+
+    def test_status_change_moves_count(self, cloud):
+        """Re-upserting a task with a new status gives -1 old, +1 new."""
+        cloud.collection.find.return_value = [{"task_id": "1", "data": {"status": "pending"}}]
+
+        changes = cloud._upsert_batch([("1", {"status": "completed"})], "u1", "now")
+
+        assert changes == Counter({"pending": -1, "completed": 1})
+        assert cloud.collection.bulk_write.call_count == 1
+
+    def test_unchanged_status_and_new_task(self, cloud):
+        """Same-status re-upserts count nothing; new tasks count once."""
+        cloud.collection.find.return_value = [{"task_id": "1", "data": {"status": "pending"}}]
+
+        changes = cloud._upsert_batch(
+            [("1", {"status": "pending"}), ("2", {"status": "pending"})], "u1", "now"
+        )
+
+        assert +changes == Counter({"pending": 1})
+
+    def test_apply_task_delta_sends_counter_updates(self, cloud):
+        """apply_task_delta writes the deltas and bumps the data version."""
+        cloud.collection.find.return_value = [{"task_id": "1", "data": {"status": "pending"}}]
+
+        assert cloud.apply_task_delta({"1": {"status": "completed"}}, user_id="u1")
+
+        updates = count_updates(cloud)
+        assert len(updates) == 2
+        assert inc("pending", -1) in updates
+        assert inc("completed", 1) in updates
+        cloud.state_collection.update_one.assert_called_once()
+
+    def test_missing_counters_are_rebuilt(self, cloud):
+        """Without stored counters, they are recounted from the tasks."""
+        cloud.counts_collection.count_documents.return_value = 0
+        cloud.collection.aggregate.return_value = [{"_id": "pending", "count": 3}]
+
+        cloud._apply_count_changes(Counter({"pending": 1}), "u1")
+
+        cloud.counts_collection.bulk_write.assert_not_called()
+        cloud.counts_collection.insert_many.assert_called_once_with(
+            [{"user_id": "u1", "status": "pending", "count": 3}]
+        )
+
+
+class TestDeleteBatch:
+    """Deleting tasks keeps the counters in step."""
+
+    def test_mix_of_existing_and_missing_ids(self, cloud):
+        """Only the tasks that existed are uncounted."""
+        cloud.collection.find.return_value = [
+            {"data": {"status": "pending"}},
+            {"data": {"status": "completed"}},
+        ]
+        cloud.collection.delete_many.return_value.deleted_count = 2
+
+        assert cloud.delete_tasks_from_cloud(["1", "2", "missing"], user_id="u1") == 2
+
+        task_filter = {"user_id": "u1", "task_id": {"$in": ["1", "2", "missing"]}}
+        cloud.collection.delete_many.assert_called_once_with(task_filter)
+        updates = count_updates(cloud)
+        assert len(updates) == 2
+        assert inc("pending", -1) in updates
+        assert inc("completed", -1) in updates
+        cloud.state_collection.update_one.assert_called_once()
+
+    def test_only_missing_ids(self, cloud):
+        """Nothing deleted means no counter or version writes."""
+        cloud.collection.find.return_value = []
+        cloud.collection.delete_many.return_value.deleted_count = 0
+
+        assert cloud.delete_tasks_from_cloud(["missing"], user_id="u1") == 0
+
+        cloud.counts_collection.bulk_write.assert_not_called()
+        cloud.state_collection.update_one.assert_not_called()
+
+    def test_concurrent_change_rebuilds_counts(self, cloud):
+        """A delete count that disagrees with the lookup triggers a recount."""
+        cloud.collection.find.return_value = [{"data": {"status": "pending"}}]
+        cloud.collection.delete_many.return_value.deleted_count = 2
+        cloud.collection.aggregate.return_value = [{"_id": "completed", "count": 1}]
+
+        assert cloud._delete_batch(["1", "2"], "u1") == 2
+
+        cloud.counts_collection.bulk_write.assert_not_called()
+        cloud.counts_collection.delete_many.assert_called_once_with({"user_id": "u1"})
+        cloud.counts_collection.insert_many.assert_called_once_with(
+            [{"user_id": "u1", "status": "completed", "count": 1}]
+        )
+
+
+class TestSyncFromCloud:
+    """Fetching tasks back, with the data version check."""
+
+    @pytest.fixture
+    def stored(self, cloud):
+        """Store one task at data version 3."""
+        cloud.state_collection.find_one.return_value = {"version": 3}
+        cloud.collection.find.return_value.batch_size.return_value = [
+            {"task_id": "1", "data": {"title": "Task 1"}}
+        ]
+        return cloud
+
+    def test_unchanged_version_returns_cached_copy(self, stored):
+        """A second sync at the same version skips the full fetch."""
+        first = stored.sync_tasks_from_cloud("u1")
+        first["1"]["title"] = "Changed by caller"
+        second = stored.sync_tasks_from_cloud("u1")
+
+        assert second == {"1": {"title": "Task 1"}}
+        assert stored.collection.find.call_count == 1
+
+    def test_new_version_fetches_again(self, stored):
+        """A bumped version forces a full fetch."""
+        stored.sync_tasks_from_cloud("u1")
+        stored.state_collection.find_one.return_value = {"version": 4}
+        stored.sync_tasks_from_cloud("u1")
+
+        assert stored.collection.find.call_count == 2
+
+    def test_no_version_is_never_cached(self, stored):
+        """Without a version document every sync fetches."""
+        stored.state_collection.find_one.return_value = None
+        stored.sync_tasks_from_cloud("u1")
+        stored.sync_tasks_from_cloud("u1")
+
+        assert stored.collection.find.call_count == 2
+
+
+class TestChangeStreamMirror:
+    """Folding change events into the in-memory mirror."""
+
+    @pytest.fixture
+    def mirrored(self, cloud):
+        """Mirror one task for user u1 behind a live stream thread."""
+        cloud._stream_user_id = "u1"
+        cloud._stream_tasks = {"1": {"title": "Task 1"}}
+        cloud._stream_doc_ids = {"oid1": "1"}
+        cloud._stream_thread = MagicMock()
+        cloud._stream_thread.is_alive.return_value = True
+        return cloud
+
+    def test_insert_update_and_delete(self, mirrored):
+        """Inserts and updates store the full document; deletes map back by _id."""
+        mirrored._apply_change({"operationType": "insert", "fullDocument": {
+            "_id": "oid2", "task_id": "2", "data": {"title": "Task 2"}}})
+        mirrored._apply_change({"operationType": "update", "fullDocument": {
+            "_id": "oid1", "task_id": "1", "data": {"title": "Renamed"}}})
+        mirrored._apply_change({"operationType": "delete", "documentKey": {"_id": "oid2"}})
+        mirrored._apply_change({"operationType": "delete", "documentKey": {"_id": "other-user"}})
+
+        assert mirrored._stream_tasks == {"1": {"title": "Renamed"}}
+        assert mirrored._stream_doc_ids == {"oid1": "1"}
+
+    def test_sync_served_from_mirror(self, mirrored):
+        """A live mirror answers without touching the database."""
+        tasks = mirrored.sync_tasks_from_cloud("u1")
+        tasks["1"]["title"] = "Changed by caller"
+
+        assert mirrored.sync_tasks_from_cloud("u1") == {"1": {"title": "Task 1"}}
+        mirrored.collection.find.assert_not_called()
+        mirrored.state_collection.find_one.assert_not_called()
+
+    def test_invalidate_stops_mirror(self, mirrored):
+        """An invalidate event hands syncs back to the database."""
+        mirrored._apply_change({"operationType": "invalidate"})
+
+        assert mirrored._stream_stop.is_set()
+        assert not mirrored._stream_is_live("u1")
+
+    def test_read_after_own_write_skips_mirror(self, mirrored):
+        """Right after this client writes, tasks are read back and the mirror refreshed."""
+        mirrored.collection.find.return_value = [
+            {"_id": "oid1", "task_id": "1", "data": {"title": "Renamed"}}
+        ]
+        mirrored.apply_task_delta({"1": {"title": "Renamed"}}, user_id="u1")
+
+        assert mirrored.sync_tasks_from_cloud("u1") == {"1": {"title": "Renamed"}}
+        mirrored.collection.find.assert_called_with({"user_id": "u1"}, {"task_id": 1, "data": 1})
+
+        mirrored.collection.find.reset_mock()
+        assert mirrored.sync_tasks_from_cloud("u1") == {"1": {"title": "Renamed"}}
+        mirrored.collection.find.assert_not_called()
+
+    def test_resuming_stream_not_trusted(self, mirrored):
+        """While the follower reconnects, syncs read from the database."""
+        mirrored._stream_resuming = True
+        mirrored.state_collection.find_one.return_value = None
+        mirrored.collection.find.return_value.batch_size.return_value = [
+            {"task_id": "1", "data": {"title": "Newer"}}
+        ]
+
+        assert mirrored.sync_tasks_from_cloud("u1") == {"1": {"title": "Newer"}}
+
+
+class TestIndexes:
+    """Index setup on connect."""
+
+    def test_legacy_indexes_dropped(self, cloud):
+        """The old single-field indexes are dropped; missing ones are ignored."""
+        def drop_index(name):
+            if name != "status_1":
+                raise OperationFailure("index not found", code=27)
+
+        cloud.collection.drop_index.side_effect = drop_index
+        cloud._ensure_indexes()
+
+        dropped = [call.args[0] for call in cloud.collection.drop_index.call_args_list]
+        assert dropped == ["user_id_1", "status_1", "priority_1", "created_at_1"]
+        cloud.collection.create_index.assert_any_call([("user_id", 1), ("task_id", 1)], unique=True)
@@ -0,0 +1,116 @@
+"""
+Unit tests for the CLI's cloud update buffering.
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import task_cli
+from task_manager import TaskManager
+
+
+@pytest.fixture
+def exit_handlers(monkeypatch):
+    """Capture atexit registrations instead of running them at interpreter exit."""
+    handlers = []
+    monkeypatch.setattr(task_cli.atexit, "register",
+                        lambda func, *args, **kwargs: handlers.append((func, args, kwargs)))
+    return handlers
+
+
+@pytest.fixture
+def cli(monkeypatch, exit_handlers):
+    """Build a TaskCLI with an in-memory task store and a connected mock cloud."""
+    monkeypatch.setattr(task_cli, "TaskManager", lambda: TaskManager(db_path=":memory:"))
+    monkeypatch.setattr(task_cli, "MongoDBCloudSync", MagicMock)
+    monkeypatch.setattr(task_cli, "get_auth_handler", MagicMock)
+    cli = task_cli.TaskCLI()
+    cli.cloud_sync.is_connected.return_value = True
+    cli._user_id = "user-1"
+    yield cli
+    cli._sync_pool.shutdown(wait=True)
+
+
+def run_exit_handlers(cli, handlers):
+    """Mimic interpreter exit: the executor stops first, then atexit runs last-in first-out."""
+    cli._sync_pool.shutdown(wait=True)
+    for func, args, kwargs in reversed(handlers):
+        func(*args, **kwargs)
+
+
+class TestPendingFlush:
+    """Buffered task changes reach the cloud."""
+
+    def test_single_add_delivered_at_exit(self, cli, exit_handlers):
+        """A one-shot add is sent even though the buffer never fills."""
+        cli.add_task("Buy milk")
+        cli.cloud_sync.apply_task_delta.assert_not_called()
+
+        run_exit_handlers(cli, exit_handlers)
+
+        cli.cloud_sync.apply_task_delta.assert_called_once()
+        upserts, deletes, user_id = cli.cloud_sync.apply_task_delta.call_args.args
+        assert [task["title"] for task in upserts.values()] == ["Buy milk"]
+        assert deletes == []
+        assert user_id == "user-1"
+
+    def test_flush_then_exit_sends_once(self, cli, exit_handlers):
+        """Changes flushed before exit are not sent again by the exit handler."""
+        cli.add_task("Buy milk")
+        cli._flush_pending()
+
+        run_exit_handlers(cli, exit_handlers)
+
+        cli.cloud_sync.apply_task_delta.assert_called_once()
+
+    def test_close_delivers_and_drains(self, cli, exit_handlers):
+        """close() sends the pending batch and waits for the pool to finish it."""
+        cli.add_task("Buy milk")
+        cli.close()
+
+        cli.cloud_sync.apply_task_delta.assert_called_once()
+        with pytest.raises(RuntimeError):
+            cli._sync_pool.submit(print)
+
+        run_exit_handlers(cli, exit_handlers)
+        cli.cloud_sync.apply_task_delta.assert_called_once()
+
+    def test_idle_change_sent_after_interval(self, cli, monkeypatch):
+        """A lone change is sent once the flush interval passes, with no further commands."""
+        monkeypatch.setattr(task_cli, "PENDING_FLUSH_INTERVAL", 0.01)
+        cli.add_task("Buy milk")
+
+        deadline = time.monotonic() + 2.0
+        while not cli.cloud_sync.apply_task_delta.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        cli.cloud_sync.apply_task_delta.assert_called_once()
+        assert cli._flush_timer is None
+
+    def test_sync_waits_for_queued_changes(self, cli):
+        """A full upload starts only after queued deltas have been applied."""
+        calls = []
+        cli.cloud_sync.apply_task_delta.side_effect = lambda *args: (time.sleep(0.05), calls.append("delta"))
+        cli.cloud_sync.sync_tasks_to_cloud.side_effect = lambda *args, **kwargs: calls.append("upload")
+        cli.cloud_sync.sync_tasks_from_cloud.return_value = {}
+
+        cli.add_task("Buy milk")
+        cli._flush_pending()
+        cli.complete_task("1")
+        cli.sync_with_cloud("up")
+
+        assert calls == ["delta", "delta", "upload"]
+
+
+class TestInteractiveMode:
+    """Interactive command parsing."""
+
+    def test_title_with_apostrophe(self, cli, monkeypatch):
+        """Everything after the command name is passed through unchanged."""
+        lines = iter(["ADD Don't forget  milk", "quit"])
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(lines))
+
+        task_cli.run_interactive_mode(cli)
+
+        assert [task.title for task in cli.task_manager.get_all_tasks()] == ["Don't forget  milk"]
@@ -3,13 +3,14 @@ Unit tests for Task Manager module.
 """
 
 import pytest
-import tempfile
 import os
+import sys
 import json
+from dataclasses import fields
 from datetime import datetime, timezone
 from unittest.mock import patch
 
-from task_manager import TaskManager, Task, Priority, TaskStatus
+from task_manager import TaskManager, Task, Priority, TaskStatus, STREAM_THRESHOLD_BYTES
 
 
 class TestTask:
@@ -52,6 +53,25 @@ class TestTask:
         assert 'created_at' in task_dict
         assert 'updated_at' in task_dict
 
+    def test_task_to_dict_covers_all_fields(self):
+        """Test that serialization includes every field and copies tags."""
+        task = Task(id="1", title="Test Task", tags=["work"])
+
+        task_dict = task.to_dict()
+        task_dict['tags'].append("home")
+
+        assert list(task_dict) == [field.name for field in fields(Task)]
+        assert task.tags == ["work"]
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10")
+    def test_task_uses_slots(self):
+        """Test that tasks carry no per-instance __dict__."""
+        task = Task(id="1", title="Slotted")
+
+        assert not hasattr(task, "__dict__")
+        with pytest.raises(AttributeError):
+            task.priorty = Priority.HIGH
+
     def test_task_from_dict(self):
         """Test task deserialization from dictionary."""
         task_data = {
@@ -79,22 +99,15 @@ class TestTaskManager:
     """Test TaskManager functionality."""
 
     @pytest.fixture
-    def temp_db_path(self):
-        """Create a temporary database file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write('{}')
-            temp_path = f.name
-        
-        yield temp_path
-        
-        # Cleanup
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
+    def task_manager(self):
+        """Create a TaskManager instance that keeps tasks in memory."""
+        return TaskManager(db_path=":memory:")
 
     @pytest.fixture
-    def task_manager(self, temp_db_path):
-        """Create a TaskManager instance with temporary database."""
-        return TaskManager(db_path=temp_db_path)
+    def populated_task_manager(self, task_manager, sample_tasks):
+        """Create an in-memory TaskManager preloaded with the sample tasks."""
+        task_manager.import_tasks(sample_tasks)
+        return task_manager
 
     def test_add_task(self, task_manager):
         """Test adding a task."""
@@ -120,43 +133,56 @@ class TestTaskManager:
         assert task is not None
         assert task.title == "Test Task"
 
-    def test_get_all_tasks(self, task_manager):
+    def test_get_all_tasks(self, populated_task_manager):
         """Test getting all tasks."""
-        task_manager.add_task("Task 1")
-        task_manager.add_task("Task 2")
-        task_manager.add_task("Task 3")
-        
-        tasks = task_manager.get_all_tasks()
+        tasks = populated_task_manager.get_all_tasks()
         assert len(tasks) == 3
-        assert all(isinstance(task, Task) for task in tasks)
+        assert all(type(task) is Task for task in tasks)
 
-    def test_get_tasks_by_status(self, task_manager):
+    def test_get_tasks_by_status(self, populated_task_manager):
         """Test filtering tasks by status."""
-        task_manager.add_task("Task 1")
+        pending_tasks = populated_task_manager.get_tasks_by_status(TaskStatus.PENDING)
+        completed_tasks = populated_task_manager.get_tasks_by_status(TaskStatus.COMPLETED)
+        
+        assert [task.title for task in pending_tasks] == ["Task 2", "Task 3"]
+        assert [task.title for task in completed_tasks] == ["Task 1"]
+
+    def test_status_index_follows_changes(self, temp_db_path):
+        """Test that status and priority lookups track updates, deletes and reloads."""
+        task_manager = TaskManager(db_path=temp_db_path)
+        task_manager.add_task("Task 1", priority=Priority.LOW)
         task_manager.add_task("Task 2")
+        task_manager.update_task("1", status=TaskStatus.IN_PROGRESS, priority=Priority.HIGH)
+        task_manager.delete_task("2")
+
+        assert task_manager.get_tasks_by_status(TaskStatus.PENDING) == []
+        assert [t.id for t in task_manager.get_tasks_by_status(TaskStatus.IN_PROGRESS)] == ["1"]
+        assert task_manager.get_tasks_by_priority(Priority.LOW) == []
+
+        reloaded = TaskManager(db_path=temp_db_path)
+        assert [t.id for t in reloaded.get_tasks_by_priority(Priority.HIGH)] == ["1"]
+
+    def test_filtered_tasks_keep_creation_order(self, task_manager):
+        """Test that status and priority lookups list tasks oldest first."""
+        for title in ("Task 1", "Task 2", "Task 3"):
+            task_manager.add_task(title)
+        task_manager.complete_task("3")
         task_manager.complete_task("1")
-        
-        pending_tasks = task_manager.get_tasks_by_status(TaskStatus.PENDING)
-        completed_tasks = task_manager.get_tasks_by_status(TaskStatus.COMPLETED)
-        
-        assert len(pending_tasks) == 1
-        assert len(completed_tasks) == 1
-        assert pending_tasks[0].title == "Task 2"
-        assert completed_tasks[0].title == "Task 1"
+        task_manager.update_task("2", priority=Priority.HIGH)
+        task_manager.update_task("1", priority=Priority.HIGH)
 
-    def test_get_tasks_by_priority(self, task_manager):
+        assert [t.id for t in task_manager.get_tasks_by_status(TaskStatus.COMPLETED)] == ["1", "3"]
+        assert [t.id for t in task_manager.get_tasks_by_priority(Priority.HIGH)] == ["1", "2"]
+
+    def test_get_tasks_by_priority(self, populated_task_manager):
         """Test filtering tasks by priority."""
-        task_manager.add_task("Task 1", priority=Priority.LOW)
-        task_manager.add_task("Task 2", priority=Priority.HIGH)
-        task_manager.add_task("Task 3", priority=Priority.MEDIUM)
-        
-        high_priority_tasks = task_manager.get_tasks_by_priority(Priority.HIGH)
-        low_priority_tasks = task_manager.get_tasks_by_priority(Priority.LOW)
+        high_priority_tasks = populated_task_manager.get_tasks_by_priority(Priority.HIGH)
+        low_priority_tasks = populated_task_manager.get_tasks_by_priority(Priority.LOW)
         
         assert len(high_priority_tasks) == 1
         assert len(low_priority_tasks) == 1
-        assert high_priority_tasks[0].title == "Task 2"
-        assert low_priority_tasks[0].title == "Task 1"
+        assert high_priority_tasks[0].title == "Task 1"
+        assert low_priority_tasks[0].title == "Task 3"
 
     def test_update_task(self, task_manager):
         """Test updating a task."""
@@ -180,6 +206,7 @@ class TestTaskManager:
         
         assert completed_task.status == TaskStatus.COMPLETED
         assert completed_task.completed_at is not None
+        assert completed_task.completed_at == completed_task.updated_at
 
     def test_delete_task(self, task_manager):
         """Test deleting a task."""
@@ -195,20 +222,33 @@ class TestTaskManager:
         # Verify task is deleted
         assert task_manager.get_task("1") is None
 
+    def test_task_ids_not_reused_after_delete(self, temp_db_path):
+        """Test that new tasks never take a deleted task's ID, even after a reload."""
+        task_manager = TaskManager(db_path=temp_db_path)
+        task_manager.add_task("Task 1")
+        task_manager.add_task("Task 2")
+        task_manager.delete_task("2")
+        assert task_manager.add_task("Task 3").id == "3"
+
+        # Only the change log records the deleted IDs
+        task_manager.delete_task("3")
+        task_manager.close()
+        reloaded = TaskManager(db_path=temp_db_path)
+        assert reloaded.add_task("Task 4").id == "4"
+        assert reloaded.get_task("1").title == "Task 1"
+
+        reloaded.delete_task("4")
+        reloaded._compact()
+        assert TaskManager(db_path=temp_db_path).add_task("Task 5").id == "5"
+
     def test_delete_nonexistent_task(self, task_manager):
         """Test deleting a non-existent task."""
         result = task_manager.delete_task("999")
         assert result is False
 
-    def test_get_task_statistics(self, task_manager):
+    def test_get_task_statistics(self, populated_task_manager):
         """Test getting task statistics."""
-        # Add some tasks
-        task_manager.add_task("Task 1", priority=Priority.HIGH)
-        task_manager.add_task("Task 2", priority=Priority.MEDIUM)
-        task_manager.add_task("Task 3", priority=Priority.LOW)
-        task_manager.complete_task("1")
-        
-        stats = task_manager.get_task_statistics()
+        stats = populated_task_manager.get_task_statistics()
         
         assert stats['total'] == 3
         assert stats['completed'] == 1
@@ -220,6 +260,23 @@ class TestTaskManager:
         assert stats['by_status']['completed'] == 1
         assert stats['by_status']['pending'] == 2
 
+    def test_task_statistics_follow_changes(self, task_manager):
+        """Test that statistics track updates, deletes and imported replacements."""
+        task_manager.add_task("Task 1", priority=Priority.HIGH)
+        task_manager.add_task("Task 2", priority=Priority.HIGH)
+        task_manager.update_task("1", priority=Priority.LOW, status=TaskStatus.IN_PROGRESS)
+        task_manager.delete_task("2")
+        task_manager.import_tasks({"1": Task(id="1", title="Task 1", status=TaskStatus.COMPLETED).to_dict()})
+
+        stats = task_manager.get_task_statistics()
+
+        assert stats['total'] == 1
+        assert stats['completed'] == 1
+        assert stats['pending'] == 0
+        assert stats['completion_rate'] == 100.0
+        assert stats['by_priority'] == {'low': 0, 'medium': 1, 'high': 0}
+        assert stats['by_status']['in_progress'] == 0
+
     def test_get_task_statistics_empty(self, task_manager):
         """Test getting statistics for empty task list."""
         stats = task_manager.get_task_statistics()
@@ -245,6 +302,30 @@ class TestTaskManager:
         assert len(results) == 1
         assert results[0].title == "Database design"
 
+    def test_search_tasks_partial_words_and_updates(self, task_manager):
+        """Test that search matches inside words and follows task updates."""
+        task_manager.add_task("Complete project report", description="Quarterly numbers")
+        task_manager.add_task("Call plumber")
+
+        assert [t.id for t in task_manager.search_tasks("plete proj")] == ["1"]
+        assert [t.id for t in task_manager.search_tasks("ARTER")] == ["1"]
+        assert task_manager.search_tasks("report call") == []
+
+        task_manager.update_task("2", title="Call electrician", tags=["home"])
+        assert task_manager.search_tasks("plumber") == []
+        assert [t.id for t in task_manager.search_tasks("hom")] == ["2"]
+
+    def test_search_index_follows_deletes_and_imports(self, task_manager):
+        """Test that search forgets deleted tasks and reindexes replaced ones."""
+        task_manager.add_task("Water plants")
+        task_manager.add_task("Water bill")
+        task_manager.delete_task("1")
+        assert [t.id for t in task_manager.search_tasks("water")] == ["2"]
+
+        task_manager.import_tasks({"2": Task(id="2", title="Electric bill").to_dict()})
+        assert task_manager.search_tasks("water") == []
+        assert [t.id for t in task_manager.search_tasks("electric")] == ["2"]
+
     def test_export_tasks(self, task_manager):
         """Test exporting tasks for cloud sync."""
         task_manager.add_task("Task 1")
@@ -288,6 +369,16 @@ class TestTaskManager:
         assert tasks[0].title == "Cloud Task 1"
         assert tasks[1].title == "Cloud Task 2"
 
+    def test_in_memory_manager_touches_no_files(self, task_manager, tmp_path, monkeypatch):
+        """Test that the in-memory backend never writes to disk."""
+        monkeypatch.chdir(tmp_path)
+        task_manager.add_task("Ephemeral")
+        task_manager.import_tasks({"9": Task(id="9", title="Imported").to_dict()})
+        task_manager.close()
+
+        assert list(tmp_path.iterdir()) == []
+        assert task_manager.add_task("Next").id == "10"
+
     def test_persistence(self, temp_db_path):
         """Test that tasks are persisted to file."""
         # Create first manager and add task
@@ -301,6 +392,146 @@ class TestTaskManager:
         assert task is not None
         assert task.title == "Persistent Task"
 
+    def test_tasks_load_on_first_access(self, temp_db_path):
+        """Test that tasks are read from disk when first needed, not on construction."""
+        task_manager = TaskManager(db_path=temp_db_path)
+        other = TaskManager(db_path=temp_db_path)
+        other.add_task("Written after construction")
+        other.close()
+
+        assert "tasks" not in vars(task_manager)
+        assert task_manager.add_task("Next").id == "2"
+        assert task_manager.get_task("1").title == "Written after construction"
+
+    def test_persistence_without_orjson(self, temp_db_path, monkeypatch):
+        """Test that the stdlib json fallback round-trips snapshots and the change log."""
+        monkeypatch.setattr("task_manager.orjson", None)
+        manager1 = TaskManager(db_path=temp_db_path)
+        manager1.add_task("Plain JSON", tags=["fallback"])
+        manager1.complete_task("1")
+        manager1.close()
+
+        manager2 = TaskManager(db_path=temp_db_path)
+        manager2.import_tasks({"5": Task(id="5", title="Compacted").to_dict()})
+        manager3 = TaskManager(db_path=temp_db_path)
+
+        assert manager3.get_task("1").status == TaskStatus.COMPLETED
+        assert manager3.get_task("1").tags == ["fallback"]
+        assert manager3.get_task("5").title == "Compacted"
+
+    def test_streamed_snapshot_matches_json_load(self, temp_db_path, monkeypatch):
+        """Test that a large snapshot parsed with ijson loads like the json path."""
+        ijson = pytest.importorskip("ijson")
+        writer = TaskManager(db_path=temp_db_path)
+        with writer.batch():
+            for i in range(400):
+                writer.add_task(f"Task {i}", description="x" * 100, tags=["bulk"],
+                                priority=Priority.HIGH if i % 2 else Priority.LOW)
+            writer.complete_task("7")
+            writer.delete_task("400")
+        writer._compact()
+        assert os.path.getsize(temp_db_path) >= STREAM_THRESHOLD_BYTES
+
+        monkeypatch.setattr("task_manager.ijson", ijson)
+        streamed = TaskManager(db_path=temp_db_path)
+        monkeypatch.setattr("task_manager.ijson", None)
+        parsed = TaskManager(db_path=temp_db_path)
+
+        assert streamed.export_tasks() == parsed.export_tasks()
+        assert len(streamed.tasks) == 399
+        # The deleted last ID is only kept reserved by _meta.next_id
+        assert streamed._next_id == parsed._next_id == 401
+        assert streamed.get_task("7").status == TaskStatus.COMPLETED
+
+    def test_reload_picks_up_changes_on_disk(self, temp_db_path):
+        """Test that reload replaces in-memory state with what is on disk."""
+        task_manager = TaskManager(db_path=temp_db_path)
+        task_manager.add_task("Original")
+        other = TaskManager(db_path=temp_db_path)
+        other.add_task("From another process")
+        other.close()
+
+        task_manager.reload()
+
+        assert [t.title for t in task_manager.get_all_tasks()] == ["Original", "From another process"]
+        assert task_manager.search_tasks("process")[0].id == "2"
+
+    def test_persistence_replays_change_log(self, temp_db_path):
+        """Test that updates and deletes survive a reload via the change log."""
+        manager1 = TaskManager(db_path=temp_db_path)
+        manager1.add_task("Kept Task")
+        manager1.add_task("Deleted Task")
+        manager1.complete_task("1")
+        manager1.delete_task("2")
+        manager1.close()
+
+        # The snapshot is untouched until compaction
+        with open(temp_db_path) as f:
+            assert json.load(f) == {}
+
+        manager2 = TaskManager(db_path=temp_db_path)
+        assert manager2.get_task("1").status == TaskStatus.COMPLETED
+        assert manager2.get_task("2") is None
+
+    def test_change_log_skips_torn_entry(self, temp_db_path):
+        """Test that a partially written log line is ignored on load."""
+        manager1 = TaskManager(db_path=temp_db_path)
+        manager1.add_task("Logged Task")
+        manager1.close()
+        with open(f"{temp_db_path}.log", "a") as f:
+            f.write('{"op": "upsert", "id": "2", "ta')
+
+        manager2 = TaskManager(db_path=temp_db_path)
+        assert [task.title for task in manager2.get_all_tasks()] == ["Logged Task"]
+
+    def test_batch_logs_changes_once_on_exit(self, temp_db_path):
+        """Test that changes made in a batch are logged together when it exits."""
+        task_manager = TaskManager(db_path=temp_db_path)
+        with task_manager.batch():
+            task_manager.add_task("Task 1")
+            task_manager.add_task("Task 2")
+            task_manager.complete_task("1")
+            task_manager.delete_task("2")
+            assert not os.path.exists(f"{temp_db_path}.log")
+        task_manager.close()
+
+        with open(f"{temp_db_path}.log") as f:
+            entries = [json.loads(line) for line in f]
+        assert [(entry['op'], entry['id']) for entry in entries] == [("upsert", "1"), ("delete", "2")]
+        assert TaskManager(db_path=temp_db_path).get_task("1").status == TaskStatus.COMPLETED
+
+    def test_compaction_folds_log_into_snapshot(self, temp_db_path):
+        """Test that compaction rewrites the snapshot and clears the log."""
+        manager1 = TaskManager(db_path=temp_db_path)
+        manager1.add_task("Compacted Task")
+        manager1._compact()
+
+        assert not os.path.exists(f"{temp_db_path}.log")
+        with open(temp_db_path) as f:
+            assert json.load(f)["1"]["title"] == "Compacted Task"
+
+        manager2 = TaskManager(db_path=temp_db_path)
+        assert manager2.get_task("1").title == "Compacted Task"
+
+    def test_stale_log_skipped_after_compaction(self, temp_db_path):
+        """Test that a log left behind by a crash mid-compaction doesn't undo an import."""
+        manager1 = TaskManager(db_path=temp_db_path)
+        manager1.add_task("Local Task")
+        manager1.close()
+        with open(f"{temp_db_path}.log", "rb") as f:
+            old_log = f.read()
+
+        manager1.import_tasks({"1": Task(id="1", title="Cloud Task").to_dict()})
+        # Crash before the old log was removed
+        with open(f"{temp_db_path}.log", "wb") as f:
+            f.write(old_log)
+
+        manager2 = TaskManager(db_path=temp_db_path)
+        assert manager2.get_task("1").title == "Cloud Task"
+        manager2.complete_task("1")
+        manager2.close()
+        assert TaskManager(db_path=temp_db_path).get_task("1").status == TaskStatus.COMPLETED
+
     def test_invalid_priority(self, task_manager):
         """Test handling of invalid priority."""
         with pytest.raises(ValueError):
@@ -8,7 +8,9 @@ from utils import (
     format_timestamp, format_priority, format_status,
     validate_priority, validate_status, validate_date, parse_date,
     truncate_text, highlight_search_term, validate_email,
-    sanitize_filename, format_file_size
+    sanitize_filename, format_file_size, create_task_table,
+    create_search_results_table, priority_text, status_text,
+    show_progress_with_spinner
 )
 
 
@@ -27,61 +29,65 @@ class TestFormatting:
         formatted = format_timestamp(invalid_timestamp)
         assert formatted == invalid_timestamp
 
-    def test_format_priority(self):
-        """Test priority formatting."""
-        assert "HIGH" in format_priority("high")
-        assert "MEDIUM" in format_priority("medium")
-        assert "LOW" in format_priority("low")
-        assert "unknown" in format_priority("unknown")
+    @pytest.mark.parametrize("fn,value,expected", [
+        (format_priority, "high", "HIGH"),
+        (format_priority, "medium", "MEDIUM"),
+        (format_priority, "low", "LOW"),
+        (format_priority, "unknown", "unknown"),
+        (format_status, "pending", "PENDING"),
+        (format_status, "in_progress", "IN PROGRESS"),
+        (format_status, "completed", "COMPLETED"),
+        (format_status, "cancelled", "CANCELLED"),
+        (format_status, "unknown", "unknown"),
+    ])
+    def test_format_priority_and_status(self, fn, value, expected):
+        """Test priority and status formatting."""
+        assert expected in fn(value)
 
-    def test_format_status(self):
-        """Test status formatting."""
-        assert "PENDING" in format_status("pending")
-        assert "IN PROGRESS" in format_status("in_progress")
-        assert "COMPLETED" in format_status("completed")
-        assert "CANCELLED" in format_status("cancelled")
-        assert "unknown" in format_status("unknown")
+    def test_priority_and_status_text(self):
+        """Test pre-parsed table cell texts."""
+        assert priority_text("high") is priority_text("high")
+        assert priority_text("high").plain == "HIGH"
+        assert str(priority_text("high").spans[0].style) == "red"
+        assert priority_text("MEDIUM").plain == "MEDIUM"
+        assert status_text("in_progress").plain == "IN PROGRESS"
+        assert status_text("unknown").plain == "unknown"
 
 
 class TestValidation:
     """Test validation functions."""
 
-    def test_validate_priority(self):
-        """Test priority validation."""
-        assert validate_priority("low") is True
-        assert validate_priority("medium") is True
-        assert validate_priority("high") is True
-        assert validate_priority("LOW") is True  # Case insensitive
-        assert validate_priority("invalid") is False
-        assert validate_priority("") is False
-
-    def test_validate_status(self):
-        """Test status validation."""
-        assert validate_status("pending") is True
-        assert validate_status("in_progress") is True
-        assert validate_status("completed") is True
-        assert validate_status("cancelled") is True
-        assert validate_status("PENDING") is True  # Case insensitive
-        assert validate_status("invalid") is False
-        assert validate_status("") is False
-
-    def test_validate_date(self):
-        """Test date validation."""
-        assert validate_date("2023-01-01") is True
-        assert validate_date("2023-01-01T12:00:00") is True
-        assert validate_date("2023-01-01T12:00:00+00:00") is True
-        assert validate_date("invalid-date") is False
-        assert validate_date("") is False
-
-    def test_validate_email(self):
-        """Test email validation."""
-        assert validate_email("test@example.com") is True
-        assert validate_email("user.name@domain.co.uk") is True
-        assert validate_email("test+tag@example.com") is True
-        assert validate_email("invalid-email") is False
-        assert validate_email("@example.com") is False
-        assert validate_email("test@") is False
-        assert validate_email("") is False
+    @pytest.mark.parametrize("fn,value,expected", [
+        (validate_priority, "low", True),
+        (validate_priority, "medium", True),
+        (validate_priority, "high", True),
+        (validate_priority, "LOW", True),  # Case insensitive
+        (validate_priority, "invalid", False),
+        (validate_priority, "", False),
+        (validate_status, "pending", True),
+        (validate_status, "in_progress", True),
+        (validate_status, "completed", True),
+        (validate_status, "cancelled", True),
+        (validate_status, "PENDING", True),  # Case insensitive
+        (validate_status, "invalid", False),
+        (validate_status, "", False),
+        (validate_date, "2023-01-01", True),
+        (validate_date, "2023-01-01T12:00:00", True),
+        (validate_date, "2023-01-01T12:00:00+00:00", True),
+        (validate_date, "invalid-date", False),
+        (validate_date, "", False),
+        (validate_email, "test@example.com", True),
+        (validate_email, "user.name@domain.co.uk", True),
+        (validate_email, "test+tag@example.com", True),
+        (validate_email, "invalid-email", False),
+        (validate_email, "@example.com", False),
+        (validate_email, "test@", False),
+        (validate_email, "test@example.com\n", False),
+        (validate_email, "", False),
+    ])
+    def test_validation(self, fn, value, expected):
+        """Test priority, status, date and email validation."""
+        assert fn(value) is expected
 
 
 class TestParsing:
@@ -97,6 +103,7 @@ class TestParsing:
         
         # Test invalid formats
         assert parse_date("invalid-date") is None
+        assert parse_date("\uff11\uff12/01/2023") is None  # Fullwidth digits
         assert parse_date("") is None
         assert parse_date(None) is None
 
@@ -118,6 +125,19 @@ class TestParsing:
         result = parse_date("01/01/2023")
         assert result == "2023-01-01T00:00:00"
 
+    @pytest.mark.parametrize("value,expected", [
+        ("2023-1-5 7:05:00", "2023-01-05T07:05:00"),
+        ("13/01/2023", "2023-01-13T00:00:00"),  # Only valid day-first
+        ("01/13/2023", "2023-01-13T00:00:00"),  # Only valid month-first
+        ("02/03/2023", "2023-03-02T00:00:00"),  # Day-first wins when both fit
+        ("2023-02-30", None),
+        ("2023-01-01 24:00:00", None),
+        ("2023-01-01T00:00:00", None),
+    ])
+    def test_parse_date_fields(self, value, expected):
+        """Test date parsing field ranges and day/month order."""
+        assert parse_date(value) == expected
+
 
 class TestTextProcessing:
     """Test text processing functions."""
@@ -158,6 +178,63 @@ class TestTextProcessing:
         highlighted = highlight_search_term(text, "nonexistent")
         assert highlighted == text
 
+    @pytest.mark.parametrize("text,term,expected", [
+        ("Test test TEST", "test", "[yellow]Test[/yellow] [yellow]test[/yellow] [yellow]TEST[/yellow]"),
+        ("a.b axb", ".", "a[yellow].[/yellow]b axb"),
+        ("Café CAFÉ", "café", "[yellow]Café[/yellow] [yellow]CAFÉ[/yellow]"),  # Non-ASCII uses the regex
+    ])
+    def test_highlight_search_term_matches(self, text, term, expected):
+        """Test that every case-insensitive literal match is highlighted."""
+        assert highlight_search_term(text, term) == expected
+
+
+def table_cells(table):
+    """Return each column's cells as a list."""
+    return [list(column.cells) for column in table.columns]
+
+
+class TestTables:
+    """Test table building functions."""
+
+    def test_task_table_fresh_for_unchanged_rows(self):
+        """Test that an unchanged task list gives a new table with the same cells."""
+        tasks = [{"id": "1", "title": "Task 1", "priority": "high", "status": "pending",
+                  "created_at": "2023-01-01T00:00:00+00:00"}]
+
+        table = create_task_table(iter(tasks))
+        table.add_row("extra")
+        again = create_task_table(iter(tasks))
+        assert again is not table
+        assert again.row_count == 1
+        assert table_cells(again) == [cells[:1] for cells in table_cells(table)]
+
+        tasks[0]["status"] = "completed"
+        assert table_cells(create_task_table(iter(tasks))) != table_cells(again)
+
+    def test_search_results_table_fresh_per_query(self):
+        """Test that search tables are rebuilt per call and highlighted per query."""
+        results = [{"id": "1", "title": "Write tests", "tags": ["dev"]}]
+
+        table = create_search_results_table(results, "test")
+        again = create_search_results_table(results, "test")
+        assert again is not table
+        assert table_cells(again) == table_cells(table)
+        assert table_cells(create_search_results_table(results, "write")) != table_cells(table)
+
+
+class TestSpinner:
+    """Test the progress spinner."""
+
+    def test_nested_spinner_keeps_outer_running(self):
+        """Test that an inner spinner exiting leaves the outer one running."""
+        with show_progress_with_spinner("Outer") as (outer, outer_task):
+            with show_progress_with_spinner("Inner") as (inner, _):
+                assert inner is outer
+                assert len(outer.tasks) == 2
+            assert outer.live.is_started
+            assert [task.id for task in outer.tasks] == [outer_task]
+        assert not outer.live.is_started
+
 
 class TestFileOperations:
     """Test file operation functions."""
@@ -203,6 +280,17 @@ class TestFileOperations:
         # Test terabytes
         assert format_file_size(1024 * 1024 * 1024 * 1024) == "1.0 TB"
 
+    @pytest.mark.parametrize("size,expected", [
+        (0, "0.0 B"),
+        (1536.0, "1.5 KB"),  # Float sizes
+        (1024 * 1024 - 1, "1024.0 KB"),  # Rounds up within the lower unit
+        (1024 ** 4 - 1, "1024.0 GB"),
+        (5 * 1024 ** 5, "5120.0 TB"),  # TB is the largest unit
+    ])
+    def test_format_file_size_boundaries(self, size, expected):
+        """Test file size formatting around unit boundaries."""
+        assert format_file_size(size) == expected
+
 
 class TestEdgeCases:
     """Test edge cases and error handling."""
@@ -217,6 +305,10 @@ class TestEdgeCases:
         
         # Test malformed timestamp
         assert format_timestamp("2023-13-45T25:70:99") == "2023-13-45T25:70:99"
+        assert format_timestamp("2023-13-45T25:70:99Z") == "2023-13-45T25:70:99Z"
+        
+        # Test UTC 'Z' suffix
+        assert format_timestamp("2023-01-01T12:00:00Z") == "2023-01-01 12:00:00"
 
     def test_parse_date_edge_cases(self):
         """Test date parsing edge cases."""
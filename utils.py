@@ -6,8 +6,10 @@ Provides helper functions for formatting, validation, and common operations.
 
 import os
 import re
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Optional
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -19,54 +21,100 @@ import logging
 
 logger = logging.getLogger(__name__)
 console = Console()
-
-
+# Built on first use; started by the outermost spinner and stopped when it
+# exits, so nested spinners add a line instead of stopping the outer one
+_spinner_progress: Optional[Progress] = None
+_spinner_depth = 0
+_ensured_directories = set()
+
+PRIORITY_LABELS = {
+    'high': '[red]HIGH[/red]',
+    'medium': '[yellow]MEDIUM[/yellow]',
+    'low': '[green]LOW[/green]'
+}
+STATUS_LABELS = {
+    'pending': '[yellow]PENDING[/yellow]',
+    'in_progress': '[blue]IN PROGRESS[/blue]',
+    'completed': '[green]COMPLETED[/green]',
+    'cancelled': '[red]CANCELLED[/red]'
+}
+# The same labels parsed once, so table cells skip Rich's markup parser
+PRIORITY_TEXTS = {value: Text.from_markup(label) for value, label in PRIORITY_LABELS.items()}
+STATUS_TEXTS = {value: Text.from_markup(label) for value, label in STATUS_LABELS.items()}
+VALID_PRIORITIES = frozenset(('low', 'medium', 'high'))
+VALID_STATUSES = frozenset(('pending', 'in_progress', 'completed', 'cancelled'))
+FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+MB_PER_BYTE = 1.0 / (1024 * 1024)
+UNSAFE_FILENAME_CHARS = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+ISO_YEAR_RE = re.compile(r'[0-9]{4}')
+# [0-9] rather than \d: strptime rejects non-ASCII digits
+DATE_RE = re.compile(
+    r'(?P<year>[0-9]{4})-(?P<month>[0-9]{1,2})-(?P<day>[0-9]{1,2}| [1-9])'
+    r'(?:\s+(?P<hour>[0-9]{1,2}):(?P<minute>[0-9]{1,2}):(?P<second>[0-9]{1,2}))?'
+    r'|(?P<first>[0-9]{1,2}| [1-9])/(?P<second_part>[0-9]{1,2}| [1-9])/(?P<slash_year>[0-9]{4})'
+)
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+
+# Each task's timestamps are formatted again on every table render; a render
+# cycles through all of them, so the cache must hold a whole table's worth
+@lru_cache(maxsize=4096)
 def format_timestamp(timestamp: str) -> str:
     """Format timestamp for display."""
     if timestamp is None:
         return "None"
     try:
-        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        return dt.strftime('%Y-%m-%d %H:%M:%S')
+        # fromisoformat only understands a trailing 'Z' from Python 3.11
+        iso = timestamp[:-1] + '+00:00' if timestamp.endswith('Z') else timestamp
+        dt = datetime.fromisoformat(iso)
+        # Same as strftime('%Y-%m-%d %H:%M:%S') without the format-string parsing
+        return (f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} "
+                f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}")
     except Exception:
         return timestamp
 
 
 def format_priority(priority: str) -> str:
     """Format priority for display with colors."""
-    priority_map = {
-        'high': '[red]HIGH[/red]',
-        'medium': '[yellow]MEDIUM[/yellow]',
-        'low': '[green]LOW[/green]'
-    }
-    return priority_map.get(priority.lower(), priority)
+    # Stored values are already lowercase, so only lowercase on a miss
+    label = PRIORITY_LABELS.get(priority)
+    return label if label is not None else PRIORITY_LABELS.get(priority.lower(), priority)
 
 
 def format_status(status: str) -> str:
     """Format status for display with colors."""
-    status_map = {
-        'pending': '[yellow]PENDING[/yellow]',
-        'in_progress': '[blue]IN PROGRESS[/blue]',
-        'completed': '[green]COMPLETED[/green]',
-        'cancelled': '[red]CANCELLED[/red]'
-    }
-    return status_map.get(status.lower(), status)
+    label = STATUS_LABELS.get(status)
+    return label if label is not None else STATUS_LABELS.get(status.lower(), status)
+
+
+def priority_text(priority: str) -> Text:
+    """Styled priority for a table cell, parsed once per known value."""
+    text = PRIORITY_TEXTS.get(priority)
+    return text if text is not None else Text.from_markup(format_priority(priority))
+
+
+def status_text(status: str) -> Text:
+    """Styled status for a table cell, parsed once per known value."""
+    text = STATUS_TEXTS.get(status)
+    return text if text is not None else Text.from_markup(format_status(status))
 
 
 def validate_priority(priority: str) -> bool:
     """Validate priority value."""
-    valid_priorities = ['low', 'medium', 'high']
-    return priority.lower() in valid_priorities
+    return priority in VALID_PRIORITIES or priority.lower() in VALID_PRIORITIES
 
 
 def validate_status(status: str) -> bool:
     """Validate status value."""
-    valid_statuses = ['pending', 'in_progress', 'completed', 'cancelled']
-    return status.lower() in valid_statuses
+    return status in VALID_STATUSES or status.lower() in VALID_STATUSES
 
 
 def validate_date(date_str: str) -> bool:
     """Validate date string format."""
+    # Every ISO form fromisoformat accepts opens with a four-digit year, so
+    # most invalid input is turned away without raising
+    if not ISO_YEAR_RE.match(date_str):
+        return False
     try:
         datetime.fromisoformat(date_str)
         return True
@@ -79,26 +127,36 @@ def parse_date(date_str: str) -> Optional[str]:
     if not date_str:
         return None
     
-    # Try different date formats
-    formats = [
-        '%Y-%m-%d',
-        '%Y-%m-%d %H:%M:%S',
-        '%d/%m/%Y',
-        '%m/%d/%Y'
-    ]
-    
-    for fmt in formats:
+    # Accepts what strptime would for '%Y-%m-%d', '%Y-%m-%d %H:%M:%S',
+    # '%d/%m/%Y' and '%m/%d/%Y' (tried in that order), without calling it
+    match = DATE_RE.fullmatch(date_str)
+    if match is None:
+        return None
+    if match['year'] is not None:
+        time_parts = [int(match[name]) for name in ('hour', 'minute', 'second') if match[name]]
+        candidates = [(int(match['year']), int(match['month']), int(match['day']), *time_parts)]
+    else:
+        # Only a day may carry strptime's leading space; day-first wins when both fit
+        first, second = match['first'], match['second_part']
+        candidates = [(int(match['slash_year']), int(month), int(day))
+                      for day, month in ((first, second), (second, first))
+                      if not month.startswith(' ')]
+
+    for fields in candidates:
         try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.isoformat()
+            return datetime(*fields).isoformat()
         except ValueError:
             continue
-    
     return None
 
 
-def create_task_table(tasks: List[Dict[str, Any]], title: str = "Tasks") -> Table:
+def create_task_table(tasks: Iterable[Dict[str, Any]], title: str = "Tasks") -> Table:
     """Create a rich table for displaying tasks."""
+    rows = tuple(
+        (task.get('id', ''), task.get('title', ''), task.get('priority', 'medium'),
+         task.get('status', 'pending'), task.get('created_at', ''), task.get('due_date'))
+        for task in tasks
+    )
     table = Table(title=title, show_header=True, header_style="bold magenta")
     
     table.add_column("ID", style="cyan", no_wrap=True)
@@ -108,56 +166,67 @@ def create_task_table(tasks: List[Dict[str, Any]], title: str = "Tasks") -> Tabl
     table.add_column("Created", style="dim")
     table.add_column("Due Date", style="dim")
     
-    for task in tasks:
-        table.add_row(
-            task.get('id', ''),
-            task.get('title', '')[:50] + ('...' if len(task.get('title', '')) > 50 else ''),
-            format_priority(task.get('priority', 'medium')),
-            format_status(task.get('status', 'pending')),
-            format_timestamp(task.get('created_at', '')),
-            format_timestamp(task.get('due_date', '')) if task.get('due_date') else '-'
-        )
+    for cells in _task_table_cells(rows):
+        table.add_row(*cells)
     
     return table
 
 
+# Redisplaying an unchanged list (e.g. in interactive mode) reuses the formatted
+# cells; callers still get a fresh Table they are free to modify
+@lru_cache(maxsize=32)
+def _task_table_cells(rows: tuple) -> tuple:
+    """Format (id, title, priority, status, created_at, due_date) rows into table cells."""
+    return tuple(
+        (
+            task_id,
+            task_title if len(task_title) <= 50 else task_title[:50] + '...',
+            priority_text(priority),
+            status_text(status),
+            format_timestamp(created_at),
+            format_timestamp(due_date) if due_date else '-'
+        )
+        for task_id, task_title, priority, status, created_at, due_date in rows
+    )
+
+
 def create_statistics_panel(stats: Dict[str, Any]) -> Panel:
     """Create a rich panel for displaying statistics."""
     if 'error' in stats:
         return Panel(f"[red]Error: {stats['error']}[/red]", title="Statistics")
     
-    content = f"""
+    parts = [f"""
 [bold]Total Tasks:[/bold] {stats.get('total', 0)}
 [bold]Completed:[/bold] {stats.get('completed', 0)}
 [bold]Pending:[/bold] {stats.get('pending', 0)}
 [bold]Completion Rate:[/bold] {stats.get('completion_rate', 0):.1f}%
 
 [bold]By Priority:[/bold]
-"""
-    
-    for priority, count in stats.get('by_priority', {}).items():
-        content += f"  {priority.title()}: {count}\n"
-    
-    content += "\n[bold]By Status:[/bold]\n"
-    for status, count in stats.get('by_status', {}).items():
-        content += f"  {status.replace('_', ' ').title()}: {count}\n"
+"""]
+    parts.extend(f"  {priority.title()}: {count}\n"
+                 for priority, count in stats.get('by_priority', {}).items())
+    parts.append("\n[bold]By Status:[/bold]\n")
+    parts.extend(f"  {status.replace('_', ' ').title()}: {count}\n"
+                 for status, count in stats.get('by_status', {}).items())
     
-    return Panel(content, title="Task Statistics")
+    return Panel(''.join(parts), title="Task Statistics")
 
 
 def create_cloud_health_panel(health: Dict[str, Any]) -> Panel:
     """Create a rich panel for displaying cloud health."""
     if health.get('status') == 'connected':
+        database = health.get('database', {})
+        collection = health.get('collection', {})
         content = f"""
 [green]✓ Connected to MongoDB Atlas[/green]
 
-[bold]Database:[/bold] {health.get('database', {}).get('name', 'N/A')}
-[bold]Collections:[/bold] {health.get('database', {}).get('collections', 0)}
-[bold]Data Size:[/bold] {health.get('database', {}).get('data_size', 0)} bytes
+[bold]Database:[/bold] {database.get('name', 'N/A')}
+[bold]Collections:[/bold] {database.get('collections', 0)}
+[bold]Data Size:[/bold] {database.get('data_size', 0)} bytes
 
-[bold]Collection:[/bold] {health.get('collection', {}).get('name', 'N/A')}
-[bold]Documents:[/bold] {health.get('collection', {}).get('documents', 0)}
-[bold]Size:[/bold] {health.get('collection', {}).get('size', 0)} bytes
+[bold]Collection:[/bold] {collection.get('name', 'N/A')}
+[bold]Documents:[/bold] {collection.get('documents', 0)}
+[bold]Size:[/bold] {collection.get('size', 0)} bytes
 
 [dim]Last Check: {health.get('last_check', 'N/A')}[/dim]
 """
@@ -167,15 +236,28 @@ def create_cloud_health_panel(health: Dict[str, Any]) -> Panel:
     return Panel(content, title="Cloud Health")
 
 
+@contextmanager
 def show_progress_with_spinner(message: str):
-    """Show a progress spinner with message."""
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
-        task = progress.add_task(message, total=None)
-        return progress, task
+    """Show a progress spinner with message while the block runs."""
+    global _spinner_progress, _spinner_depth
+    if _spinner_progress is None:
+        _spinner_progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console
+        )
+    progress = _spinner_progress
+    if _spinner_depth == 0:
+        progress.start()
+    _spinner_depth += 1
+    task = progress.add_task(message, total=None)
+    try:
+        yield progress, task
+    finally:
+        progress.remove_task(task)
+        _spinner_depth -= 1
+        if _spinner_depth == 0:
+            progress.stop()
 
 
 def prompt_for_task_details() -> Dict[str, Any]:
@@ -241,7 +323,7 @@ def print_info(message: str):
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe file operations."""
     # Remove or replace unsafe characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = filename.translate(UNSAFE_FILENAME_CHARS)
     # Remove leading/trailing spaces and dots
     filename = filename.strip(' .')
     # Ensure filename is not empty
@@ -250,40 +332,41 @@ def sanitize_filename(filename: str) -> str:
 
 def ensure_directory_exists(path: str) -> None:
     """Ensure directory exists, create if it doesn't."""
+    # Directories this process already created or found are not checked again
+    if path in _ensured_directories:
+        return
     os.makedirs(path, exist_ok=True)
+    _ensured_directories.add(path)
 
 
 def get_file_size_mb(filepath: str) -> float:
     """Get file size in megabytes."""
     try:
-        size_bytes = os.path.getsize(filepath)
-        return size_bytes / (1024 * 1024)
+        # 2**-20 is exact, so this equals dividing by 1024 * 1024
+        return os.stat(filepath).st_size * MB_PER_BYTE
     except OSError:
         return 0.0
 
 
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    # Each unit is 2**10 of the previous one, so the bit length picks it directly
+    index = min((int(size_bytes).bit_length() - 1) // 10, len(FILE_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * index)):.1f} {FILE_SIZE_UNITS[index]}"
 
 
 def validate_email(email: str) -> bool:
     """Validate email format."""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_RE.fullmatch(email) is not None
 
 
 def truncate_text(text: str, max_length: int = 50) -> str:
     """Truncate text to specified length."""
     if text is None:
         return "None"
-    if len(text) <= max_length:
-        return text
-    return text[:max_length-3] + "..."
+    return text if len(text) <= max_length else text[:max_length-3] + "..."
 
 
 def highlight_search_term(text: str, search_term: str) -> str:
@@ -293,12 +376,44 @@ def highlight_search_term(text: str, search_term: str) -> str:
     if not search_term:
         return text
     
-    pattern = re.compile(re.escape(search_term), re.IGNORECASE)
-    return pattern.sub(lambda m: f"[yellow]{m.group()}[/yellow]", text)
+    if text.isascii() and search_term.isascii():
+        # lower() keeps ASCII offsets intact, so plain find() can stand in for the regex
+        return _highlight_ascii(text, search_term)
+    return _highlight_pattern(search_term).sub(r'[yellow]\g<0>[/yellow]', text)
+
+
+def _highlight_ascii(text: str, search_term: str) -> str:
+    """Highlight case-insensitive matches of an ASCII term in ASCII text."""
+    lower_text = text.lower()
+    term = search_term.lower()
+    index = lower_text.find(term)
+    if index < 0:
+        return text
 
+    parts = []
+    start = 0
+    while index >= 0:
+        end = index + len(term)
+        parts.extend((text[start:index], '[yellow]', text[index:end], '[/yellow]'))
+        start = end
+        index = lower_text.find(term, start)
+    parts.append(text[start:])
+    return ''.join(parts)
 
-def create_search_results_table(results: List[Dict[str, Any]], query: str) -> Table:
+
+@lru_cache(maxsize=128)
+def _highlight_pattern(search_term: str) -> re.Pattern:
+    """Compile a case-insensitive pattern for a literal search term."""
+    return re.compile(re.escape(search_term), re.IGNORECASE)
+
+
+def create_search_results_table(results: Iterable[Dict[str, Any]], query: str) -> Table:
     """Create a table for search results."""
+    rows = tuple(
+        (result.get('id', ''), result.get('title', ''), result.get('description'),
+         tuple(result.get('tags', [])))
+        for result in results
+    )
     table = Table(title=f"Search Results for '{query}'", show_header=True, header_style="bold magenta")
     
     table.add_column("ID", style="cyan", no_wrap=True)
@@ -306,16 +421,26 @@ def create_search_results_table(results: List[Dict[str, Any]], query: str) -> Ta
     table.add_column("Description", style="white")
     table.add_column("Tags", style="dim")
     
-    for result in results:
-        title = highlight_search_term(result.get('title', ''), query)
-        description = highlight_search_term(result.get('description', ''), query) if result.get('description') else '-'
-        tags = ', '.join(result.get('tags', []))
+    for cells in _search_results_cells(rows, query):
+        table.add_row(*cells)
+    
+    return table
+
+
+@lru_cache(maxsize=32)
+def _search_results_cells(rows: tuple, query: str) -> tuple:
+    """Format (id, title, description, tags) rows into highlighted table cells."""
+    cells = []
+    for task_id, task_title, description, tags in rows:
+        title = highlight_search_term(task_title, query)
+        description = highlight_search_term(description, query) if description else '-'
+        tags = ', '.join(tags)
         
-        table.add_row(
-            result.get('id', ''),
+        cells.append((
+            task_id,
             title,
             truncate_text(description, 40),
             truncate_text(tags, 30)
-        )
+        ))
     
-    return table 
\ No newline at end of file
+    return tuple(cells)